@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 
 from _creator.settings import settings
 from user_auth.routes import router as auth_router
+from utils.words_from_text import warm_up_taggers, tagger_stats
 
 
 def server():
@@ -42,6 +43,9 @@ def server():
         Base.metadata.create_all(bind=engine)        
         app.include_router(auth_router)
 
+        warm_up_taggers()
+        print("tagger pool is ready: ", tagger_stats())
+
         print("service is started.")
 
     def shutdown():
@@ -1,8 +1,10 @@
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 
-from utils.words_from_text import extract_words_from_text
+from utils.words_from_text import tokenize
 from db import Example, WordExample, Word
+from methods.example_tokens import save_example_tokens
+from methods.example_reservoir import add_to_reservoirs
 
 
 def gen_example_words(
@@ -12,28 +14,28 @@ def gen_example_words(
 ) -> Dict[str, Any]:
     examples = db.query(Example).filter(Example.id.in_(example_ids)).all()
 
+    # 누락된 WordExample 연결에도 같은 분석 결과를 쓴다
+    tokenized_list = [tokenize(example.jp_text) for example in examples]
     words_dict_global = {}
-
-    for i, example in enumerate(examples):
-        document, words_dict = extract_words_from_text(example.jp_text)
-        words_dict_global.update(words_dict)
+    for tokenized in tokenized_list:
+        words_dict_global.update(tokenized.words)
 
     words_existing = db.query(Word).filter(Word.lemma_id.in_(list(words_dict_global.keys()))
                                             ).where(Word.user_id == user_id).all()
     words_dict_existing = {w.lemma_id: w.id for w in words_existing}
     for lemma_id, word_data in words_dict_global.items():
         if lemma_id not in words_dict_existing:
-            pos = word_data["pos1"]
+            pos = word_data.pos1
             level = "N1"
             if pos in ["助詞", "記号", "助動詞","補助記号","接尾辞", "代名詞"]:
                 continue
             new_word = Word(
                 user_id=user_id,
                 lemma_id=lemma_id,
-                lemma=word_data["lemma"],
-                jp_pron=word_data["pronBase"],
-                kr_pron=word_data["pos1"],
-                kr_mean=word_data["type"],
+                lemma=word_data.lemma,
+                jp_pron=word_data.pronBase,
+                kr_pron=word_data.pos1,
+                kr_mean=word_data.type,
                 level=level,
             )
             db.add(new_word)
@@ -45,12 +47,13 @@ def gen_example_words(
     word_examples = db.query(WordExample).filter(WordExample.example_id.in_(example_ids)).all()
     word_examples_list = [(w.word_id, w.example_id) for w in word_examples]
 
-    for i, example in enumerate(examples):
-        document, words_dict = extract_words_from_text(example.jp_text)
-        for word_data in words_dict.values():
-            if word_data["lemma_id"] not in words_dict_existing:
+    new_links = []
+    for example, tokenized in zip(examples, tokenized_list):
+        save_example_tokens(example.id, example.jp_text, tokenized, db)
+        for word_data in tokenized.words.values():
+            if word_data.lemma_id not in words_dict_existing:
                 continue
-            word_id = words_dict_existing[word_data["lemma_id"]]
+            word_id = words_dict_existing[word_data.lemma_id]
             if (word_id, example.id) in word_examples_list:
                 continue
             new_word_example = WordExample(
@@ -59,5 +62,7 @@ def gen_example_words(
             )
             db.add(new_word_example)
             db.flush()
+            new_links.append((word_id, example.id))
+    add_to_reservoirs(new_links, db)
     db.commit()
     return {"message": "Example words generated successfully"}
\ No newline at end of file
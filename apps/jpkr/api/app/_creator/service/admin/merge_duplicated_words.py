@@ -4,6 +4,8 @@ from sqlalchemy import and_
 import uuid
 
 from db import Word, WordExample, UserWordSkill
+from methods.word_skill_stats import refresh_word_skill_stats
+from methods.example_reservoir import refresh_example_reservoirs
 
 
 def merge_duplicated_words(
@@ -46,27 +48,46 @@ def merge_duplicated_words(
     db.flush()  # ID 생성을 위해 flush
     
     # 기존 단어들의 관련 데이터를 새 단어로 연결
+    linked_example_ids = set()
+    skill_by_user = {}
     for word_id in word_ids:
         # 기존 단어 조회
         existing_word = db.query(Word).filter(Word.id == word_id).first()
         if not existing_word:
             continue
         
-        # 1. WordExample 연결
+        # 1. WordExample 연결 (여러 단어가 같은 예문에 연결돼 있으면 하나만 남김)
         word_examples = db.query(WordExample).filter(WordExample.word_id == word_id).all()
         for word_example in word_examples:
+            if word_example.example_id in linked_example_ids:
+                db.delete(word_example)
+                continue
+            linked_example_ids.add(word_example.example_id)
             word_example.word_id = new_word.id
                 
-        # 2. UserWordSkill 연결
+        # 2. UserWordSkill 연결 (같은 사용자의 숙련도가 여럿이면 reading이 높은 쪽만 남김)
         user_word_skills = db.query(UserWordSkill).filter(UserWordSkill.word_id == word_id).all()
         for user_word_skill in user_word_skills:
+            kept = skill_by_user.get(user_word_skill.user_id)
+            if kept is not None:
+                if (user_word_skill.reading or 0) > (kept.reading or 0):
+                    kept.reading, kept.listening, kept.speaking = user_word_skill.reading, user_word_skill.listening, user_word_skill.speaking
+                db.delete(user_word_skill)
+                continue
+            skill_by_user[user_word_skill.user_id] = user_word_skill
             user_word_skill.word_id = new_word.id
+
+    # 옮긴 연결을 먼저 flush: autoflush=False라서 이대로 단어를 지우면 cascade가 DB의 옛 연결(=옮긴 행)을 다시 읽어 함께 삭제한다
+    db.flush()
                     
     # 기존 단어들 삭제
     for word_id in word_ids:
         existing_word = db.query(Word).filter(Word.id == word_id).first()
         if existing_word:
             db.delete(existing_word)
+    db.flush()
+    refresh_word_skill_stats([new_word.id, *word_ids], db)
+    refresh_example_reservoirs([new_word.id, *word_ids], db)
     
     # 변경사항 커밋
     db.commit()
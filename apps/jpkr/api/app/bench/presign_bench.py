@@ -0,0 +1,59 @@
+"""
+presign_get_url 마이크로벤치마크: 호출마다 S3 클라이언트를 만드는 방식(이전) vs 공유 클라이언트(get_s3).
+
+presign은 로컬 서명만 하므로 네트워크/실제 버킷 없이 돈다. 자격 증명이 없으면 더미 값을 쓴다.
+사용 예 (app 디렉터리에서):
+    python -m bench.presign_bench --calls 2000 --threads 1,8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# settings가 import 시점에 환경변수를 읽으므로 먼저 채운다
+for name, value in (("AWS_ACCESS_KEY_ID", "bench"), ("AWS_SECRET_ACCESS_KEY", "bench"), ("S3_BUCKET", "bench-bucket")):
+    if not os.getenv(name):
+        os.environ[name] = value
+
+from settings import settings
+from utils.aws_s3 import build_s3, get_s3, presign_get_url
+
+
+def presign_with_new_client(key: str, expires: int = 600) -> str:
+    # 공유 클라이언트 도입 전의 presign_get_url과 같은 동작
+    return build_s3().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.S3_BUCKET, "Key": key},
+        ExpiresIn=expires,
+    )
+
+
+def run(fn, calls: int, threads: int) -> float:
+    keys = [f"bench/{i}.jpg" for i in range(calls)]
+    started = time.perf_counter()
+    if threads <= 1:
+        for key in keys:
+            fn(key, 600)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda key: fn(key, 600), keys))
+    return calls / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="presign throughput benchmark")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", default="1,8", help="쉼표로 구분한 스레드 수 목록")
+    args = parser.parse_args()
+
+    get_s3()  # 공유 클라이언트 생성 비용은 프로세스당 한 번이므로 측정에서 뺀다
+    print(f"{'threads':>7}  {'per-call client (url/s)':>24}  {'shared client (url/s)':>22}  {'speedup':>7}")
+    for threads in [int(t) for t in args.threads.split(",") if t.strip()]:
+        # 클라이언트 생성이 훨씬 느리므로 이전 방식은 호출 수를 줄여 잰다
+        before = run(presign_with_new_client, max(1, args.calls // 10), threads)
+        after = run(presign_get_url, args.calls, threads)
+        print(f"{threads:>7}  {before:>24.1f}  {after:>22.1f}  {after / before:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List
 from sqlalchemy import (create_engine, MetaData, func,
-    text, Text,DateTime,Integer,ForeignKey,Index,)
+    text, Text,DateTime,Integer,Float,ForeignKey,Index,JSON,)
 from sqlalchemy.orm import (DeclarativeBase,mapped_column,Mapped,relationship,sessionmaker,)
 from sqlalchemy.dialects.postgresql import (UUID)
 from pgvector.sqlalchemy import Vector
@@ -94,6 +94,27 @@ class Example(TimestampMixin, Base):
         # ),
     )
 
+class ExampleToken(TimestampMixin, Base):
+    # Example.jp_text의 형태소 분석 결과(토큰 스트림) 캐시. text_hash가 다르면 stale로 보고 다시 분석한다.
+    __tablename__ = "example_tokens"
+    example_id: Mapped[int] = mapped_column(Integer, ForeignKey("examples.id", ondelete="CASCADE"), primary_key=True)
+    text_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    stream: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+class Tag(TimestampMixin, Base):
+    # Example.tags (쉼표 구분 자유 텍스트)를 정규화한 태그 사전. name은 소문자/공백 제거된 값
+    __tablename__ = "tags"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+
+class ExampleTag(TimestampMixin, Base):
+    __tablename__ = "example_tags"
+    example_id: Mapped[int] = mapped_column(Integer, ForeignKey("examples.id", ondelete="CASCADE"), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    __table_args__ = (
+        Index("idx_example_tags_tag", "tag_id"),
+    )
+
 class WordExample(TimestampMixin, Base):
     __tablename__ = "word_examples"
     word_id: Mapped[int] = mapped_column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
@@ -106,6 +127,13 @@ class WordExample(TimestampMixin, Base):
         Index("idx_word_examples_example", "example_id"),
     )
     
+class WordExampleReservoir(TimestampMixin, Base):
+    # 단어별 예문 저수지 (최대 EXAMPLE_RESERVOIR_SIZE개의 무작위 example_id). 예문 샘플링 시 ORDER BY random() 대신 사용
+    __tablename__ = "word_example_reservoirs"
+    word_id: Mapped[int] = mapped_column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
+    seen: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # 지금까지 연결된 예문 수
+    example_ids: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+
 class UserWordSkill(TimestampMixin, Base):
     __tablename__ = "user_word_skills"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -122,6 +150,35 @@ class UserWordSkill(TimestampMixin, Base):
         # UniqueConstraint("user_id", "word_id", name="uq_uws_user_word"),  # 원하면 중복 방지
     )
 
+class UserWordSchedule(TimestampMixin, Base):
+    # UserWordSkill별 SM-2 복습 일정 (1:1). 숙련도가 바뀔 때마다 해당 행만 다시 계산한다
+    __tablename__ = "user_word_schedules"
+    user_word_skill_id: Mapped[int] = mapped_column(Integer, ForeignKey("user_word_skills.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    due_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    interval_days: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    ease: Mapped[float] = mapped_column(Float, nullable=False, default=2.5)
+    repetitions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    __table_args__ = (
+        Index("idx_uwsch_user_due", "user_id", "due_at"),
+    )
+
+class UserInterestVector(TimestampMixin, Base):
+    # 사용자 관심 벡터 (예문 임베딩 공간). 본 예문/숙련도 낮은 단어의 임베딩을 감쇠 가중 평균으로 누적한다
+    __tablename__ = "user_interest_vectors"
+    user_id: Mapped[str] = mapped_column(UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    embedding: Mapped[Vector] = mapped_column(Vector(768), nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False, default=0)  # 감쇠 후 누적 가중치 합
+
+class WordSkillStat(TimestampMixin, Base):
+    # 단어별 UserWordSkill 집계 (학습자 수, 숙련도 합계). 숙련도 변경 시 해당 단어만 다시 집계한다.
+    __tablename__ = "word_skill_stats"
+    word_id: Mapped[int] = mapped_column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
+    learners: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reading_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    listening_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    speaking_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
 class UserText(TimestampMixin, Base):
     __tablename__ = "user_texts"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -133,3 +190,11 @@ class UserText(TimestampMixin, Base):
     youtube_url: Mapped[str] = mapped_column(Text, nullable=True)
     audio_url: Mapped[str] = mapped_column(Text, nullable=True)
     user: Mapped["User"] = relationship("User", back_populates="user_texts")
+
+class UserTextLine(TimestampMixin, Base):
+    # UserText의 줄 단위 분석 결과. 수정 시 line_hash가 바뀐 줄만 다시 분석한다.
+    __tablename__ = "user_text_lines"
+    user_text_id: Mapped[int] = mapped_column(Integer, ForeignKey("user_texts.id", ondelete="CASCADE"), primary_key=True)
+    line_no: Mapped[int] = mapped_column(Integer, primary_key=True)
+    line_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    stream: Mapped[dict] = mapped_column(JSON, nullable=False)
@@ -1,10 +1,22 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from db import Base, engine
+from db import Base, engine, SessionLocal
 
 from settings import settings
 from user_auth.routes import router as auth_router
+from utils.words_from_text import warm_up_taggers, tagger_stats
+from utils.parallel_tokenize import shutdown_tokenize_workers
+from service.feed_examples import feed_prefetch
+from methods.recommender_registry import shutdown_recommenders
+from methods.lexicon_snapshot import lexicon_snapshot
+from methods.word_skill_stats import ensure_word_skill_stats
+from methods.example_reservoir import ensure_example_reservoirs
+from methods.word_example_graph import word_example_graph
+from methods.example_tags import ensure_example_tags
+from methods.tag_index import tag_index
+from methods.example_id_pool import example_id_pool
+from methods.word_schedule import ensure_word_schedules
 
 
 def server():
@@ -46,9 +58,37 @@ def server():
         Base.metadata.create_all(bind=engine)        
         app.include_router(auth_router)
 
+        # Tagger는 스레드별이라 여기서는 이벤트 루프 스레드(async 라우트)의 것만 만든다.
+        # prefetch 워커는 initializer로, 동기 라우트의 threadpool 스레드는 첫 사용 시 만든다
+        warm_up_taggers()
+        print("tagger is warmed up on the event loop thread: ", tagger_stats())
+        with SessionLocal() as db:
+            lexicon_snapshot.load(db)
+            rebuilt = ensure_word_skill_stats(db)
+            reservoirs_built = ensure_example_reservoirs(db)
+            word_example_graph.load(db)
+            tags_built = ensure_example_tags(db)
+            tag_index.load(db)
+            example_id_pool.load(db)
+            schedules_built = ensure_word_schedules(db)
+        print("lexicon snapshot is loaded: ", lexicon_snapshot.stats())
+        if rebuilt:
+            print("word skill stats are rebuilt: ", rebuilt)
+        if reservoirs_built:
+            print("example reservoirs are built: ", reservoirs_built)
+        print("word-example graph is loaded: ", word_example_graph.stats())
+        if tags_built:
+            print("example tags are built: ", tags_built)
+        print("tag index is loaded: ", tag_index.stats())
+        if schedules_built:
+            print("review schedules are created: ", schedules_built)
+
         print("service is started.")
 
     def shutdown():
+        shutdown_tokenize_workers()
+        feed_prefetch.shutdown()
+        shutdown_recommenders()
         print("service is stopped.")
 
     return app
\ No newline at end of file
@@ -0,0 +1,62 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from settings import settings
+from utils.lru_cache import LRUCache
+from utils.token_stream import text_hash
+from utils.words_from_text import TokenizedText
+from methods.lexicon_snapshot import WordRecord, choose_records, lexicon_snapshot
+from methods.resolve_words import load_words_existing
+from methods.skill_versions import skill_versions
+
+
+class AnalysisBase(NamedTuple):
+    # 사용자와 무관한 부분: 형태소 분석 결과 + lemma별 단어 후보
+    tokenized: TokenizedText
+    candidates: Dict[int, Tuple[WordRecord, ...]]
+
+
+class ResolvedText(NamedTuple):
+    document: List[List[Dict[str, Any]]]
+    words: Dict[Any, Any]
+    words_existing: Dict[int, Dict[str, Any]]
+    word_ids_not_mastered: List[int]
+
+
+# (text hash, lexicon 버전) -> AnalysisBase
+_base_cache = LRUCache(settings.ANALYSIS_CACHE_TEXTS)
+# (user_id, text hash, lexicon 버전, 숙련도 버전) -> (words_existing, word_ids_not_mastered)
+_overlay_cache = LRUCache(settings.ANALYSIS_CACHE_OVERLAYS)
+
+
+def resolve_text(text: str, db: Session, user_id: Optional[str],
+                 tokenize_fn: Callable[[], TokenizedText]) -> ResolvedText:
+    """
+    분석 결과 중 예문 샘플링을 제외한 부분을 캐시를 거쳐 만든다.
+    같은 텍스트를 다시 열면 MeCab 분석과 단어 매칭을 건너뛰고,
+    숙련도가 바뀌지 않았다면 UserWordSkill 조회도 건너뛴다.
+    tokenize_fn: 캐시에 없을 때 형태소 분석 결과를 만드는 함수
+    """
+    lexicon_snapshot.ensure_fresh(db)
+    key = (text_hash(text), lexicon_snapshot.version)
+
+    base = _base_cache.get(key)
+    if base is None:
+        tokenized = tokenize_fn()
+        base = AnalysisBase(tokenized, lexicon_snapshot.candidates(tokenized.words.keys()))
+        _base_cache.put(key, base)
+
+    overlay_key = (user_id, *key, skill_versions.get(user_id))
+    overlay = _overlay_cache.get(overlay_key)
+    if overlay is None:
+        word_records = choose_records(base.candidates, user_id)
+        overlay = load_words_existing(word_records.keys(), db, user_id, word_records=word_records)
+        _overlay_cache.put(overlay_key, overlay)
+
+    words_existing, word_ids_not_mastered = overlay
+    return ResolvedText(base.tokenized.document, base.tokenized.words, words_existing, word_ids_not_mastered)
+
+
+def analysis_cache_stats() -> dict:
+    return {"base": _base_cache.stats(), "overlay": _overlay_cache.stats()}
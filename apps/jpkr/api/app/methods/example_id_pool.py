@@ -0,0 +1,54 @@
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from db import Example
+from settings import settings
+
+
+class ExampleIdPool:
+    """
+    전체 example id의 프로세스 로컬 정렬 배열. ORDER BY random() 없이 균등 추출할 때 쓴다.
+    examples의 (행 수, 최대 id)가 바뀌면 다시 적재한다. 확인 주기는 태그 인덱스와 같다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ids = np.empty(0, dtype=np.int64)
+        self._signature = None
+        self._refreshed_at = 0.0
+
+    def _current_signature(self, db: Session):
+        return tuple(db.execute(select(func.count(Example.id), func.max(Example.id))).one())
+
+    def load(self, db: Session, signature=None):
+        ids = np.asarray(db.execute(select(Example.id).order_by(Example.id)).scalars().all(), dtype=np.int64)
+        with self._lock:
+            self.ids = ids
+            self._signature = signature if signature is not None else self._current_signature(db)
+            self._refreshed_at = time.monotonic()
+
+    def refresh(self, db: Session):
+        signature = self._current_signature(db)
+        if signature != self._signature:
+            self.load(db, signature)
+        else:
+            self._refreshed_at = time.monotonic()
+
+    def invalidate(self):
+        # 이 프로세스에서 예문을 추가/삭제한 직후: 다음 조회 때 바로 다시 적재한다
+        self._signature = None
+        self._refreshed_at = 0.0
+
+    def ensure_fresh(self, db: Session):
+        if self._signature is None or time.monotonic() - self._refreshed_at > settings.TAG_INDEX_REFRESH_SEC:
+            self.refresh(db)
+
+    def stats(self) -> dict:
+        return {"examples": len(self.ids)}
+
+
+example_id_pool = ExampleIdPool()
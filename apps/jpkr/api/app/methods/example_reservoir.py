@@ -0,0 +1,134 @@
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+
+from db import WordExample, WordExampleReservoir
+from settings import settings
+
+
+def add_to_reservoirs(links: Iterable[Tuple[int, int]], db: Session) -> None:
+    """
+    새로 생긴 (word_id, example_id) 연결을 저수지에 반영한다. (commit은 호출하는 쪽에서)
+    저수지 샘플링(Algorithm R)으로 단어별 후보가 전체 예문에서 균등하게 뽑힌 상태를 유지한다.
+    """
+    new_ids_by_word = defaultdict(list)
+    for word_id, example_id in links:
+        new_ids_by_word[word_id].append(example_id)
+    if not new_ids_by_word:
+        return
+    rows = db.execute(
+        select(WordExampleReservoir).where(WordExampleReservoir.word_id.in_(list(new_ids_by_word.keys())))
+    ).scalars().all()
+    rows_by_word = {row.word_id: row for row in rows}
+
+    size = settings.EXAMPLE_RESERVOIR_SIZE
+    for word_id, example_ids in new_ids_by_word.items():
+        row = rows_by_word.get(word_id)
+        if row is None:
+            row = WordExampleReservoir(word_id=word_id, seen=0, example_ids=[])
+            db.add(row)
+        seen = row.seen
+        reservoir = list(row.example_ids)
+        for example_id in example_ids:
+            if example_id in reservoir:
+                continue
+            seen += 1
+            if len(reservoir) < size:
+                reservoir.append(example_id)
+            else:
+                j = random.randrange(seen)
+                if j < size:
+                    reservoir[j] = example_id
+        row.seen = seen
+        row.example_ids = reservoir  # JSON 컬럼은 새 리스트를 대입해야 변경이 감지된다
+
+
+def refresh_example_reservoirs(word_ids: Iterable[int], db: Session) -> Dict[int, List[int]]:
+    """
+    단어들의 저수지를 WordExample에서 다시 뽑는다. (연결 삭제/이동, 주기적 교체. commit은 호출하는 쪽에서)
+    Returns: word_id -> 새 저수지의 example_id 목록 (연결이 없어 지운 단어는 빠짐)
+    """
+    word_ids = set(word_ids)
+    if not word_ids:
+        return {}
+    rows = db.execute(
+        select(WordExample.word_id, WordExample.example_id).where(WordExample.word_id.in_(word_ids))
+    ).all()
+    example_ids_by_word = defaultdict(list)
+    for row in rows:
+        example_ids_by_word[row.word_id].append(row.example_id)
+    sampled = {}
+    for word_id, example_ids in example_ids_by_word.items():
+        row = db.merge(_sample_reservoir(word_id, example_ids))
+        sampled[word_id] = row.example_ids
+    empty_ids = word_ids - set(example_ids_by_word.keys())
+    if empty_ids:
+        db.execute(delete(WordExampleReservoir).where(WordExampleReservoir.word_id.in_(empty_ids)))
+    return sampled
+
+
+def rebuild_example_reservoirs(db: Session) -> int:
+    """전체 재구성 (최초 적재용)."""
+    example_ids_by_word = defaultdict(list)
+    for row in db.execute(select(WordExample.word_id, WordExample.example_id)):
+        example_ids_by_word[row.word_id].append(row.example_id)
+    db.execute(delete(WordExampleReservoir))
+    db.add_all([_sample_reservoir(word_id, example_ids) for word_id, example_ids in example_ids_by_word.items()])
+    db.commit()
+    return len(example_ids_by_word)
+
+
+def ensure_example_reservoirs(db: Session) -> int:
+    """저수지 테이블이 비어 있으면 (기능 추가 직후) 전체를 한 번 구성한다."""
+    if db.execute(select(func.count()).select_from(WordExampleReservoir)).scalar_one() > 0:
+        return 0
+    return rebuild_example_reservoirs(db)
+
+
+def _sample_reservoir(word_id: int, example_ids: List[int]) -> WordExampleReservoir:
+    size = settings.EXAMPLE_RESERVOIR_SIZE
+    sampled = example_ids if len(example_ids) <= size else random.sample(example_ids, size)
+    return WordExampleReservoir(word_id=word_id, seen=len(example_ids), example_ids=list(sampled))
+
+
+def load_reservoirs(word_ids: Iterable[int], db: Session) -> Dict[int, List[int]]:
+    """
+    word_id -> 저수지의 example_id 목록.
+    예문이 저수지보다 많은 단어는 마지막으로 뽑은 지 EXAMPLE_RESERVOIR_ROTATE_SEC가 지났으면
+    전체 연결에서 다시 뽑아 돌려준다 (같은 후보만 계속 나오지 않도록. commit은 호출하는 쪽에서)
+    """
+    word_ids = list(set(word_ids))
+    if not word_ids:
+        return {}
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.EXAMPLE_RESERVOIR_ROTATE_SEC)
+    rows = db.execute(
+        select(
+            WordExampleReservoir.word_id,
+            WordExampleReservoir.example_ids,
+            WordExampleReservoir.seen,
+            (WordExampleReservoir.updated_at < cutoff).label("expired"),
+        )
+        .where(WordExampleReservoir.word_id.in_(word_ids))
+    ).all()
+    reservoirs = {row.word_id: row.example_ids for row in rows if row.example_ids}
+    expired_ids = [row.word_id for row in rows if row.expired and row.seen > len(row.example_ids or [])]
+    if expired_ids:
+        rotated = refresh_example_reservoirs(expired_ids, db)
+        for word_id in expired_ids:
+            if rotated.get(word_id):
+                reservoirs[word_id] = rotated[word_id]
+            else:
+                reservoirs.pop(word_id, None)
+    return reservoirs
+
+
+def pick_examples(word_ids: Iterable[int], db: Session, k: int = 1) -> Dict[int, List[int]]:
+    """단어별로 최대 k개의 example_id를 저수지에서 무작위로 고른다. (정렬 없이 단어당 O(k))"""
+    return {
+        word_id: random.sample(example_ids, min(k, len(example_ids)))
+        for word_id, example_ids in load_reservoirs(word_ids, db).items()
+    }
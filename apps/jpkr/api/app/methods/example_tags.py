@@ -0,0 +1,56 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+
+from db import Example, ExampleTag, Tag
+
+
+def normalize_tag(tag: str) -> str:
+    return tag.strip().lower()
+
+
+def parse_tags(tags: str) -> Set[str]:
+    """Example.tags 자유 텍스트 ("daily, School") -> {"daily", "school"}"""
+    if not tags:
+        return set()
+    return {name for name in (normalize_tag(part) for part in tags.split(",")) if name}
+
+
+def _ensure_tags(names: Set[str], db: Session) -> Dict[str, int]:
+    if not names:
+        return {}
+    tag_ids = {
+        row.name: row.id
+        for row in db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(names))).all()
+    }
+    for name in names - set(tag_ids.keys()):
+        tag = Tag(name=name)
+        db.add(tag)
+        db.flush()
+        tag_ids[name] = tag.id
+    return tag_ids
+
+
+def sync_example_tags(examples: Iterable[Tuple[int, str]], db: Session) -> None:
+    """(example_id, tags 텍스트) 목록으로 example_tags 연결을 다시 만든다. (commit은 호출하는 쪽에서)"""
+    names_by_example = {example_id: parse_tags(tags) for example_id, tags in examples}
+    if not names_by_example:
+        return
+    tag_ids = _ensure_tags(set().union(*names_by_example.values()), db)
+    db.execute(delete(ExampleTag).where(ExampleTag.example_id.in_(list(names_by_example.keys()))))
+    db.add_all([
+        ExampleTag(example_id=example_id, tag_id=tag_ids[name])
+        for example_id, names in names_by_example.items()
+        for name in names
+    ])
+
+
+def ensure_example_tags(db: Session) -> int:
+    """태그 연결이 비어 있으면 (기능 추가 직후) 전체 예문에서 한 번 만든다."""
+    if db.execute(select(func.count()).select_from(ExampleTag)).scalar_one() > 0:
+        return 0
+    rows = db.execute(select(Example.id, Example.tags)).all()
+    sync_example_tags([(row.id, row.tags) for row in rows], db)
+    db.commit()
+    return len(rows)
@@ -0,0 +1,52 @@
+from typing import List
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db import Example, ExampleToken
+from utils.token_stream import text_hash, encode_token_stream, decode_token_stream
+from utils.words_from_text import TokenizedText, tokenize
+
+
+def save_example_tokens(example_id: int, jp_text: str, tokenized: TokenizedText, db: Session) -> None:
+    # commit은 호출하는 쪽에서
+    db.merge(ExampleToken(
+        example_id=example_id,
+        text_hash=text_hash(jp_text),
+        stream=encode_token_stream(jp_text, tokenized),
+    ))
+
+
+def tokenize_examples(examples: List[Example], db: Session) -> List[TokenizedText]:
+    """
+    예문 목록의 분석 결과를 examples 순서대로 반환한다.
+    저장된 토큰 스트림이 있고 text_hash가 일치하면 MeCab을 거치지 않는다.
+    없거나 stale한 경우 새로 분석하고 savepoint 안에서 저장한다 (lazy backfill, commit은 호출하는 쪽에서).
+    """
+    example_ids = [example.id for example in examples if example.id is not None]
+    rows = []
+    if example_ids:
+        rows = db.query(ExampleToken).filter(ExampleToken.example_id.in_(example_ids)).all()
+    rows_by_id = {row.example_id: row for row in rows}
+
+    result = []
+    backfills = []
+    for example in examples:
+        row = rows_by_id.get(example.id)
+        if row is not None and row.text_hash == text_hash(example.jp_text):
+            result.append(decode_token_stream(example.jp_text, row.stream))
+            continue
+        tokenized = tokenize(example.jp_text)
+        result.append(tokenized)
+        if example.id is not None:
+            backfills.append((example, tokenized))
+
+    if backfills:
+        try:
+            with db.begin_nested():
+                for example, tokenized in backfills:
+                    save_example_tokens(example.id, example.jp_text, tokenized, db)
+        except IntegrityError:
+            # 동시 요청 (예: 백그라운드 prefetch) 이 같은 예문을 먼저 저장한 경우: savepoint만 되돌린다
+            pass
+    return result
@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db import Example, Word, UserInterestVector
+from settings import settings
+from methods.example_reservoir import pick_examples
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def update_interest(user_id: str, embeddings, weights, db: Session) -> Optional[UserInterestVector]:
+    """
+    관심 벡터에 새 신호를 섞는다 (PK 조회 1회, commit은 호출하는 쪽에서).
+    기존 평균에는 INTEREST_DECAY를 곱해 최근 신호가 더 크게 반영되도록 하고,
+    각 임베딩은 길이 1로 맞춘 뒤 가중 평균한다. (코사인 거리만 쓰므로 크기는 의미 없음)
+    """
+    if user_id is None or len(embeddings) == 0:
+        return None
+    vectors = _unit_rows(np.asarray(embeddings, dtype=np.float64))
+    weights = np.asarray(weights, dtype=np.float64)
+    added = float(weights.sum())
+    if added <= 0:
+        return None
+    row = db.get(UserInterestVector, user_id)
+    if row is None:
+        row = UserInterestVector(user_id=user_id, embedding=(weights @ vectors) / added, weight=added)
+        db.add(row)
+        return row
+    kept = row.weight * settings.INTEREST_DECAY
+    total = kept + added
+    row.embedding = (np.asarray(row.embedding, dtype=np.float64) * kept + weights @ vectors) / total
+    row.weight = total
+    return row
+
+
+def record_engaged_examples(user_id: str, example_ids: Iterable[int], db: Session) -> Optional[UserInterestVector]:
+    """사용자가 본/반응한 예문들의 임베딩을 관심 벡터에 반영한다. (임베딩이 없는 예문은 건너뜀)"""
+    example_ids = list(set(example_ids or []))
+    if user_id is None or not example_ids:
+        return None
+    embeddings = db.execute(
+        select(Example.embedding).where(Example.id.in_(example_ids), Example.embedding.isnot(None))
+    ).scalars().all()
+    return update_interest(user_id, embeddings, np.ones(len(embeddings)), db)
+
+
+def record_low_skill_words(user_id: str, readings: Dict[int, int], db: Session) -> Optional[UserInterestVector]:
+    """
+    reading이 INTEREST_LOW_READING 미만인 단어를 관심 신호로 반영한다. 낮을수록 가중치가 크다.
+    단어 임베딩 (예문과 같은 모델로 만든 것) 을 쓰고, 없으면 그 단어의 저수지 예문 하나의 임베딩을 쓴다.
+    """
+    threshold = settings.INTEREST_LOW_READING
+    weight_by_word = {
+        word_id: (threshold - (reading or 0)) / threshold
+        for word_id, reading in readings.items()
+        if (reading or 0) < threshold
+    }
+    if user_id is None or not weight_by_word:
+        return None
+    embeddings, weights = [], []
+    rows = db.execute(
+        select(Word.id, Word.embedding).where(Word.id.in_(list(weight_by_word.keys())), Word.embedding.isnot(None))
+    ).all()
+    for row in rows:
+        embeddings.append(row.embedding)
+        weights.append(weight_by_word[row.id])
+    missing = set(weight_by_word.keys()) - {row.id for row in rows}
+    if missing:
+        picked = pick_examples(missing, db, k=1)
+        word_by_example = {example_ids[0]: word_id for word_id, example_ids in picked.items()}
+        if word_by_example:
+            example_rows = db.execute(
+                select(Example.id, Example.embedding)
+                .where(Example.id.in_(list(word_by_example.keys())), Example.embedding.isnot(None))
+            ).all()
+            for row in example_rows:
+                embeddings.append(row.embedding)
+                weights.append(weight_by_word[word_by_example[row.id]])
+    return update_interest(user_id, embeddings, weights, db)
+
+
+def load_interest_vector(user_id: str, db: Session) -> Optional[np.ndarray]:
+    if user_id is None:
+        return None
+    embedding = db.execute(
+        select(UserInterestVector.embedding).where(UserInterestVector.user_id == user_id)
+    ).scalar_one_or_none()
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype=np.float32)
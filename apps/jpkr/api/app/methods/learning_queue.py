@@ -0,0 +1,123 @@
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db import UserWordSkill
+from settings import settings
+from utils.lru_cache import LRUCache
+from methods.lexicon_snapshot import WordRecord, lexicon_snapshot
+from methods.skill_versions import skill_versions
+
+LEVEL_PRIORITY = {"N5": 1, "N4": 2, "N3": 3, "N2": 4, "N1": 5}
+NUM_LEVELS = 6  # 레벨 null 또는 기타 = 6
+
+
+def level_priority(level: Optional[str]) -> int:
+    return LEVEL_PRIORITY.get(level, NUM_LEVELS)
+
+
+class _UserBands(NamedTuple):
+    # 숙련도 합이 0보다 큰 단어 (레벨별 기본 버킷에서 제외)
+    learned: Set[int]
+    # 레벨 -> [(숙련도 합, word_id 배열)] (합 오름차순)
+    bands: Dict[int, List[Tuple[int, np.ndarray]]]
+
+
+# lexicon 버전 -> (레벨 -> word_id 배열)
+_level_cache = LRUCache(2)
+# (user_id, 숙련도 버전, lexicon 버전) -> _UserBands
+_bands_cache = LRUCache(settings.RECOMMEND_OVERLAY_USERS)
+
+
+def _level_buckets() -> Dict[int, np.ndarray]:
+    key = lexicon_snapshot.version
+    buckets = _level_cache.get(key)
+    if buckets is None:
+        grouped: Dict[int, list] = {}
+        for record in lexicon_snapshot.records():
+            grouped.setdefault(level_priority(record.level), []).append(record.id)
+        buckets = {level: np.asarray(ids, dtype=np.int64) for level, ids in grouped.items()}
+        _level_cache.put(key, buckets)
+    return buckets
+
+
+def _user_bands(user_id: str, db: Session) -> _UserBands:
+    key = (str(user_id), skill_versions.get(user_id), lexicon_snapshot.version)
+    user_bands = _bands_cache.get(key)
+    if user_bands is not None:
+        return user_bands
+    rows = db.execute(
+        select(UserWordSkill.word_id, UserWordSkill.reading, UserWordSkill.listening, UserWordSkill.speaking)
+        .where(UserWordSkill.user_id == user_id)
+    ).all()
+    records = lexicon_snapshot.resolve_ids([row.word_id for row in rows])
+    grouped: Dict[int, Dict[int, list]] = {}
+    learned = set()
+    for row in rows:
+        record = records.get(row.word_id)
+        total = (row.reading or 0) + (row.listening or 0) + (row.speaking or 0)
+        if record is None or total <= 0:
+            continue
+        learned.add(row.word_id)
+        grouped.setdefault(level_priority(record.level), {}).setdefault(total, []).append(row.word_id)
+    bands = {
+        level: [(total, np.asarray(ids, dtype=np.int64)) for total, ids in sorted(by_total.items())]
+        for level, by_total in grouped.items()
+    }
+    user_bands = _UserBands(learned, bands)
+    _bands_cache.put(key, user_bands)
+    return user_bands
+
+
+def _sample_unlearned(word_ids: np.ndarray, learned: Set[int], need: int, rng: np.random.Generator) -> List[int]:
+    """레벨 버킷에서 아직 학습하지 않은 단어를 무작위로 need개 (기대 O(need))"""
+    if need <= 0 or len(word_ids) == 0:
+        return []
+    if len(learned) * 2 >= len(word_ids):
+        # 버킷 대부분을 학습한 경우: 남은 단어를 직접 구한다
+        remaining = word_ids[~np.isin(word_ids, np.fromiter(learned, dtype=np.int64, count=len(learned)))]
+        return rng.choice(remaining, size=min(need, len(remaining)), replace=False).tolist()
+    picked = []
+    seen = set()
+    max_tries = need * 4 + 16
+    for index in rng.integers(len(word_ids), size=max_tries).tolist():
+        word_id = int(word_ids[index])
+        if word_id in learned or word_id in seen:
+            continue
+        seen.add(word_id)
+        picked.append(word_id)
+        if len(picked) >= need:
+            return picked
+    # 운 나쁘게 못 채운 경우 나머지를 직접 구한다
+    remaining = word_ids[~np.isin(word_ids, np.fromiter(learned | seen, dtype=np.int64, count=len(learned | seen)))]
+    return picked + rng.choice(remaining, size=min(need - len(picked), len(remaining)), replace=False).tolist()
+
+
+def next_words_to_learn(limit: int, db: Session, user_id: str) -> List[WordRecord]:
+    """
+    학습 큐: 레벨(N5 > ... > N1 > null) 버킷 순으로, 각 레벨 안에서는
+    숙련도 합 0인 단어(무작위) -> 숙련도 합이 작은 밴드 순(같은 합은 무작위) 으로 limit개.
+    레벨 버킷은 lexicon 스냅샷에서, 사용자 밴드는 숙련도 버전별 캐시에서 가져오므로
+    비용은 전체 단어 수가 아니라 limit에 비례한다.
+    """
+    lexicon_snapshot.ensure_fresh(db)
+    buckets = _level_buckets()
+    user_bands = _user_bands(user_id, db) if user_id is not None else _UserBands(set(), {})
+    rng = np.random.default_rng()
+
+    word_ids: List[int] = []
+    for level in range(1, NUM_LEVELS + 1):
+        need = limit - len(word_ids)
+        if need <= 0:
+            break
+        word_ids.extend(_sample_unlearned(buckets.get(level, np.empty(0, dtype=np.int64)), user_bands.learned, need, rng))
+        for _, band in user_bands.bands.get(level, []):
+            need = limit - len(word_ids)
+            if need <= 0:
+                break
+            word_ids.extend(rng.choice(band, size=min(need, len(band)), replace=False).tolist())
+
+    records = lexicon_snapshot.resolve_ids(word_ids)
+    return [records[word_id] for word_id in word_ids if word_id in records]
@@ -0,0 +1,199 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from db import Word
+from settings import settings
+from user_auth.db import User
+
+
+class WordRecord(NamedTuple):
+    id: int
+    user_id: Optional[str]
+    lemma_id: int
+    lemma: str
+    jp_pron: str
+    kr_pron: str
+    kr_mean: str
+    level: str
+    user_display_name: Optional[str]
+
+
+class LexiconSnapshot:
+    """
+    words 테이블의 프로세스 로컬 스냅샷 (lemma_id -> WordRecord 목록).
+    같은 lemma_id에 여러 사용자의 단어가 있으면 목록으로 두고, resolve 시 요청 사용자 소유를 우선한다.
+    Word.updated_at 기준으로 증분 갱신하며, 삭제는 remove() 또는 행 수 비교로 감지해 전체 재적재한다.
+    load/refresh는 _refresh_lock으로 한 번에 하나만 돈다 (겹치면 워터마크가 뒤섞이고 전체 재적재가 중복됨).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.RLock()
+        self._by_lemma: Dict[int, List[WordRecord]] = {}
+        self._by_id: Dict[int, WordRecord] = {}
+        self._watermark = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+        self.version = 0
+
+    def _select(self):
+        return (
+            select(
+                Word.id,
+                Word.user_id,
+                Word.lemma_id,
+                Word.lemma,
+                Word.jp_pron,
+                Word.kr_pron,
+                Word.kr_mean,
+                Word.level,
+                Word.updated_at,
+                User.display_name,
+            )
+            .outerjoin(User, Word.user_id == User.id)
+        )
+
+    def _upsert(self, rows) -> bool:
+        changed = False
+        for row in rows:
+            record = WordRecord(
+                row.id, row.user_id, row.lemma_id, row.lemma, row.jp_pron,
+                row.kr_pron, row.kr_mean, row.level, row.display_name,
+            )
+            if self._watermark is None or row.updated_at > self._watermark:
+                self._watermark = row.updated_at
+            old = self._by_id.get(row.id)
+            if old == record:
+                continue
+            if old is not None:
+                self._drop(old)
+            self._by_id[row.id] = record
+            if record.lemma_id:
+                owners = self._by_lemma.setdefault(record.lemma_id, [])
+                owners.append(record)
+                owners.sort(key=lambda r: r.id)
+            changed = True
+        return changed
+
+    def _drop(self, record: WordRecord):
+        self._by_id.pop(record.id, None)
+        owners = self._by_lemma.get(record.lemma_id)
+        if owners:
+            owners[:] = [r for r in owners if r.id != record.id]
+            if not owners:
+                del self._by_lemma[record.lemma_id]
+
+    def load(self, db: Session):
+        with self._refresh_lock:
+            rows = db.execute(self._select()).all()
+            with self._lock:
+                self._by_lemma = {}
+                self._by_id = {}
+                self._watermark = None
+                self._upsert(rows)
+                self._loaded = True
+                self._refreshed_at = time.monotonic()
+                self.version += 1
+
+    def refresh(self, db: Session):
+        """updated_at 워터마크 이후 변경된 단어만 다시 읽는다. 다른 갱신이 돌고 있으면 끝날 때까지 기다렸다가 다시 읽는다."""
+        with self._refresh_lock:
+            self._refresh(db)
+
+    def _refresh(self, db: Session):
+        if not self._loaded:
+            self.load(db)
+            return
+        with self._lock:
+            watermark = self._watermark
+        stmt = self._select()
+        if watermark is not None:
+            # 트랜잭션 시작 시각으로 기록된 updated_at이 늦게 커밋되는 경우를 위해 겹쳐서 읽는다
+            stmt = stmt.where(Word.updated_at >= watermark - timedelta(seconds=settings.LEXICON_REFRESH_OVERLAP_SEC))
+        rows = db.execute(stmt).all()
+        total = db.execute(select(func.count(Word.id))).scalar_one()
+        with self._lock:
+            changed = self._upsert(rows)
+            self._refreshed_at = time.monotonic()
+            if changed:
+                self.version += 1
+            needs_reload = total != len(self._by_id)
+        if needs_reload:
+            # 다른 프로세스에서 삭제/병합된 단어가 있음
+            self.load(db)
+
+    def remove(self, word_ids: Iterable[int]):
+        with self._lock:
+            changed = False
+            for word_id in word_ids:
+                record = self._by_id.get(word_id)
+                if record is not None:
+                    self._drop(record)
+                    changed = True
+            if changed:
+                self.version += 1
+
+    def ensure_fresh(self, db: Session):
+        if self._loaded and time.monotonic() - self._refreshed_at <= settings.LEXICON_REFRESH_SEC:
+            return
+        # 적재된 뒤라면 다른 요청이 갱신 중일 때 기다리지 않고 지금 스냅샷을 쓴다
+        if not self._refresh_lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            if not self._loaded or time.monotonic() - self._refreshed_at > settings.LEXICON_REFRESH_SEC:
+                self._refresh(db)
+        finally:
+            self._refresh_lock.release()
+
+    def candidates(self, lemma_ids: Iterable[Optional[int]]) -> Dict[int, Tuple[WordRecord, ...]]:
+        """lemma_id -> 같은 lemma를 가진 단어 후보 (id 순). 사용자와 무관하므로 캐시해 둘 수 있다."""
+        result = {}
+        with self._lock:
+            for lemma_id in lemma_ids:
+                owners = self._by_lemma.get(lemma_id) if lemma_id else None
+                if owners:
+                    result[lemma_id] = tuple(owners)
+        return result
+
+    def resolve(self, lemma_ids: Iterable[Optional[int]], user_id: Optional[str] = None) -> Dict[int, WordRecord]:
+        return choose_records(self.candidates(lemma_ids), user_id)
+
+    def resolve_ids(self, word_ids: Iterable[int]) -> Dict[int, WordRecord]:
+        with self._lock:
+            return {word_id: self._by_id[word_id] for word_id in word_ids if word_id in self._by_id}
+
+    def records(self) -> List[WordRecord]:
+        """현재 스냅샷의 모든 단어 (복사본)"""
+        with self._lock:
+            return list(self._by_id.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "words": len(self._by_id),
+                "lemmas": len(self._by_lemma),
+                "version": self.version,
+                "watermark": self._watermark,
+            }
+
+
+def choose_records(candidates: Dict[int, Tuple[WordRecord, ...]], user_id: Optional[str] = None) -> Dict[int, WordRecord]:
+    """후보 중 요청 사용자 소유를 우선하고, 없으면 가장 먼저 등록된 단어를 고른다."""
+    result = {}
+    for lemma_id, owners in candidates.items():
+        chosen = owners[0]
+        if user_id is not None:
+            for record in owners:
+                if str(record.user_id) == str(user_id):
+                    chosen = record
+                    break
+        result[lemma_id] = chosen
+    return result
+
+
+lexicon_snapshot = LexiconSnapshot()
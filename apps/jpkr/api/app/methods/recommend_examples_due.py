@@ -0,0 +1,83 @@
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db import Example
+from models import ExampleOut
+from utils.aws_s3 import presign_get_url
+from methods.word_example_graph import csr_for_tags, sample_examples_of
+from methods.word_schedule import due_word_ids
+from methods.recommend_examples_worst_reading import recommend_examples_worst_reading
+
+
+def recommend_examples_due(
+    limit_examples: int = 30,
+    tags: Optional[List[str]] = None,
+    db: Session = None,
+    user_id: str = None
+) -> List[ExampleOut]:
+    """
+    Spaced-repetition feed (SM-2 schedule in user_word_schedules).
+    Steps:
+    1) Take the most overdue words of the user via the (user_id, due_at) index.
+    2) Pick a random example per word from the in-memory word->example graph
+       (tag-restricted if tags are given).
+    3) If not enough words are due, fill the rest with recommend_examples_worst_reading.
+    """
+    if user_id is None:
+        return []
+
+    chosen_examples = []
+    word_ids = np.asarray(due_word_ids(user_id, db, limit_examples * 2), dtype=np.int64)
+    if len(word_ids):
+        csr, _ = csr_for_tags(tags, db)
+        word_index = np.searchsorted(csr.word_ids, word_ids)
+        present = word_index < len(csr.word_ids)
+        present[present] = csr.word_ids[word_index[present]] == word_ids[present]
+        word_index = word_index[present]
+        # Keep due order, drop duplicate examples
+        drawn_ids = list(dict.fromkeys(sample_examples_of(csr, word_index, np.random.default_rng()).tolist()))
+        rows = db.execute(
+            select(
+                Example.id,
+                Example.jp_text,
+                Example.kr_mean,
+                Example.en_prompt,
+                Example.audio_object_key,
+                Example.image_object_key,
+                Example.tags,
+            )
+            .where(Example.id.in_(drawn_ids))
+        ).all()
+        rows_by_id = {row.id: row for row in rows}
+        for example_id in drawn_ids:
+            example_row = rows_by_id.get(example_id)
+            if example_row is None:
+                continue
+            chosen_examples.append(
+                ExampleOut(
+                    id=example_row.id,
+                    jp_text=example_row.jp_text,
+                    kr_mean=example_row.kr_mean,
+                    en_prompt=example_row.en_prompt,
+                    audio_url=presign_get_url(example_row.audio_object_key, expires=600)
+                    if example_row.audio_object_key
+                    else None,
+                    image_url=presign_get_url(example_row.image_object_key, expires=600)
+                    if example_row.image_object_key
+                    else None,
+                    tags=example_row.tags,
+                )
+            )
+            if len(chosen_examples) >= limit_examples:
+                break
+
+    if len(chosen_examples) < limit_examples:
+        seen_example_ids = {example.id for example in chosen_examples}
+        for example in recommend_examples_worst_reading(limit_examples - len(chosen_examples), tags, db, user_id):
+            if example.id not in seen_example_ids:
+                seen_example_ids.add(example.id)
+                chosen_examples.append(example)
+    return chosen_examples
@@ -0,0 +1,102 @@
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from db import Example
+from models import ExampleOut
+from utils.aws_s3 import presign_get_url
+from utils.lru_cache import LRUCache
+from settings import settings
+from methods.interest_vector import load_interest_vector
+from methods.tag_index import tag_index
+from methods.word_example_graph import bitmap_contains
+from methods.recommend_examples_worst_reading import recommend_examples_worst_reading
+
+
+# user_id -> 최근 추천한 example_id tuple (같은 최근접 이웃만 반복해서 나오지 않도록)
+_recent_served = LRUCache(settings.RECOMMEND_OVERLAY_USERS)
+
+
+def recommend_examples_interest(
+    limit_examples: int = 30,
+    tags: Optional[List[str]] = None,
+    db: Session = None,
+    user_id: str = None
+) -> List[ExampleOut]:
+    """
+    Interest-vector feed: one ANN probe on the examples HNSW index.
+    Steps:
+    1) Load the user's interest vector (user_interest_vectors, one PK lookup).
+    2) Fetch the limit * INTEREST_CANDIDATES nearest examples with
+       ORDER BY embedding <=> :v LIMIT k (hnsw.ef_search raised to k).
+    3) Drop examples not matching the tags (tag index bitmap) or served recently,
+       then pick limit_examples at random among the remaining candidates.
+    4) Without a vector (new user) or on a database without pgvector, or if too few
+       candidates are left, fill with recommend_examples_worst_reading.
+    """
+    if user_id is None:
+        return []
+
+    chosen_examples = []
+    vector = load_interest_vector(user_id, db)
+    if vector is not None and db.get_bind().dialect.name == "postgresql":
+        recent = _recent_served.get(str(user_id)) or ()
+        k = limit_examples * max(1, settings.INTEREST_CANDIDATES) + len(recent)
+        # ef_search(기본 40)보다 많은 결과는 HNSW가 돌려주지 않으므로 이 트랜잭션에서만 올린다
+        db.execute(text(f"SET LOCAL hnsw.ef_search = {max(40, int(k))}"))
+        rows = db.execute(
+            select(
+                Example.id,
+                Example.jp_text,
+                Example.kr_mean,
+                Example.en_prompt,
+                Example.audio_object_key,
+                Example.image_object_key,
+                Example.tags,
+            )
+            .where(Example.embedding.isnot(None))
+            .order_by(Example.embedding.cosine_distance(vector))
+            .limit(k)
+        ).all()
+
+        matched = None
+        if tags:
+            tag_index.ensure_fresh(db)
+            matched = tag_index.lookup(tags)
+        if matched is not None and rows:
+            keep = bitmap_contains(matched[1], np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows)))
+            rows = [row for row, ok in zip(rows, keep) if ok]
+        recent_ids = set(recent)
+        rows = [row for row in rows if row.id not in recent_ids]
+        if len(rows) > limit_examples:
+            picked = np.sort(np.random.default_rng().choice(len(rows), size=limit_examples, replace=False))
+            rows = [rows[i] for i in picked]  # 가까운 순서 유지
+
+        for example_row in rows:
+            chosen_examples.append(
+                ExampleOut(
+                    id=example_row.id,
+                    jp_text=example_row.jp_text,
+                    kr_mean=example_row.kr_mean,
+                    en_prompt=example_row.en_prompt,
+                    audio_url=presign_get_url(example_row.audio_object_key, expires=600)
+                    if example_row.audio_object_key
+                    else None,
+                    image_url=presign_get_url(example_row.image_object_key, expires=600)
+                    if example_row.image_object_key
+                    else None,
+                    tags=example_row.tags,
+                )
+            )
+        served = tuple(example.id for example in chosen_examples)
+        _recent_served.put(str(user_id), (recent + served)[-limit_examples * 4:])
+
+    if len(chosen_examples) < limit_examples:
+        seen_example_ids = {example.id for example in chosen_examples}
+        for example in recommend_examples_worst_reading(limit_examples - len(chosen_examples), tags, db, user_id):
+            if example.id not in seen_example_ids:
+                seen_example_ids.add(example.id)
+                chosen_examples.append(example)
+    return chosen_examples
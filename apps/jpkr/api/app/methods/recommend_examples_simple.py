@@ -1,17 +1,31 @@
 from datetime import datetime, timezone
+import numpy as np
 from sqlalchemy import func, select, and_, or_
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from db import Example, WordExample, Word, UserWordSkill
 from models import ExampleOut
 from utils.aws_s3 import presign_get_url
+from methods.tag_index import tag_index
+from methods.example_id_pool import example_id_pool
 
 def recommend_examples_simple(limit_examples: int = 30, tags: Optional[List[str]] = None, db: Session = None, user_id: str = None) -> List[Example]:
-    # Precompute OR filter for tags, reused below
-    tag_filters = None
+    # Eligible ids come from in-memory arrays (tag index, or every example), so no ORDER BY random() scan
+    eligible_ids = None
     if tags:
-        tag_filters = [Example.tags.ilike(f"%{tag}%") for tag in tags if tag]
-    print(tag_filters)
+        tag_index.ensure_fresh(db)
+        matched = tag_index.lookup(tags)
+        if matched is not None:
+            eligible_ids = matched[0]
+    if eligible_ids is None:
+        example_id_pool.ensure_fresh(db)
+        eligible_ids = example_id_pool.ids
+    if len(eligible_ids) == 0:
+        return []
+
+    # Uniform pick without replacement; oversample a little in case some ids were deleted since the last refresh
+    limit = max(1, limit_examples)
+    picked_ids = np.random.default_rng().choice(eligible_ids, size=min(limit * 2, len(eligible_ids)), replace=False).tolist()
     stmt_ex = select(Example.id, 
                      Example.jp_text, 
                      Example.kr_mean, 
@@ -19,13 +33,10 @@ def recommend_examples_simple(limit_examples: int = 30, tags: Optional[List[str]
                      Example.audio_object_key, 
                      Example.image_object_key, 
                      Example.tags
-                     )
-    if tag_filters:
-        stmt_ex = stmt_ex.where(or_(*tag_filters))
-                     
-    stmt_ex = stmt_ex.order_by(func.random()).limit(max(1, limit_examples))
+                     ).where(Example.id.in_(picked_ids))
+    rows_by_id = {row.id: row for row in db.execute(stmt_ex).all()}
+    examples = [rows_by_id[example_id] for example_id in picked_ids if example_id in rows_by_id][:limit]
 
-    examples = db.execute(stmt_ex).all()
     examples_result = []
     for row in examples:
         examples_result.append(
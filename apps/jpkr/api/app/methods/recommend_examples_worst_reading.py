@@ -1,12 +1,17 @@
-import random
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 
-from sqlalchemy import func, select, or_
+import numpy as np
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from db import Example, WordExample, Word, UserWordSkill
+from db import Example, UserWordSkill
 from models import ExampleOut
 from utils.aws_s3 import presign_get_url
+from methods.skill_versions import skill_versions
+from methods.word_example_graph import CSR, csr_for_tags, sample_examples_of
+from settings import settings
+from utils.alias_sampling import alias_sample, build_alias_table
+from utils.lru_cache import LRUCache
 
 
 def recommend_examples_worst_reading(
@@ -18,107 +23,118 @@ def recommend_examples_worst_reading(
     """
     Pick examples by prioritizing words with the lowest reading scores.
     Steps:
-    1) Gather user reading scores per word (missing -> 100 to deprioritize).
-    2) Optionally restrict to words that have examples matching provided tags.
-    3) Weighted random pick of words (weight inversely proportional to reading).
-    4) For each chosen word, pick a random example linked via WordExample (tag-filtered if provided).
-    5) Deduplicate examples and return up to limit_examples.
+    1) Take the in-memory word->example graph, restricted to examples matching
+       the tags (via the tag index) if provided.
+    2) Overlay the user's reading scores as sparse extra weights
+       (weight inversely proportional to reading; words without a skill row count as 100).
+    3) Weighted random pick of words, then a random example per word (vectorized).
+    4) Deduplicate examples and return up to limit_examples.
     """
     if user_id is None:
         return []
 
-    # Precompute OR filter for tags, reused below
-    tag_filters = None
-    if tags:
-        tag_filters = [Example.tags.ilike(f"%{tag}%") for tag in tags if tag]
+    csr, csr_key = csr_for_tags(tags, db)
+    return _recommend_from_graph(csr, csr_key, limit_examples, db, user_id)
 
-    # 1) Load reading scores per word for this user
-    word_scores = db.execute(
-        select(
-            Word.id.label("word_id"),
-            func.coalesce(UserWordSkill.reading, 100).label("reading_score"),
-        )
-        .select_from(Word)
-        .outerjoin(
-            UserWordSkill,
-            (UserWordSkill.word_id == Word.id) & (UserWordSkill.user_id == user_id),
-        )
-    ).all()
 
-    if not word_scores:
-        return []
+def _reading_weight(score: int) -> int:
+    #weight = max(1, 101 - min(100, score))  # score 0 -> 101, score 100 -> 1
+    return max(1, 2500 - (50 - score) ** 2)
 
-    # 2) If tag filters exist, keep only words that have at least one matching example
-    if tag_filters:
-        candidate_word_ids = db.execute(
-            select(WordExample.word_id)
-            .select_from(WordExample)
-            .join(Example, Example.id == WordExample.example_id)
-            .where(or_(*tag_filters))
-            .distinct()
-        ).scalars().all()
-        candidate_word_ids_set = set(candidate_word_ids)
-        word_scores = [ws for ws in word_scores if ws.word_id in candidate_word_ids_set]
-        if not word_scores:
-            return []
-
-    # 2) Build weights (lower reading -> higher weight)
-    weights = []
-    words = []
-    for row in word_scores:
-        score = row.reading_score or 0
-        #weight = max(1, 101 - min(100, score))  # score 0 -> 101, score 100 -> 1
-        weight = max(1, 2500 - (50 - score) ** 2)
-        weights.append(weight)
-        words.append(row.word_id)
 
+class _SkillOverlay(NamedTuple):
+    # Extra weight (weight - 1) of the user's skilled words, as positions in csr.word_ids
+    word_index: np.ndarray
+    prob: np.ndarray
+    alias: np.ndarray
+    extra_total: float
+
+
+# (user_id, skill version, csr key) -> _SkillOverlay
+_overlay_cache = LRUCache(settings.RECOMMEND_OVERLAY_USERS)
+
+
+def _skill_overlay(csr: CSR, csr_key: tuple, db: Session, user_id: str) -> _SkillOverlay:
+    key = (str(user_id), skill_versions.get(user_id), csr_key)
+    overlay = _overlay_cache.get(key)
+    if overlay is not None:
+        return overlay
+    rows = db.execute(
+        select(UserWordSkill.word_id, UserWordSkill.reading).where(UserWordSkill.user_id == user_id)
+    ).all()
+    extra = {}
+    for row in rows:
+        score = row.reading if row.reading is not None else 100
+        extra[row.word_id] = _reading_weight(score) - 1
+    word_ids = np.fromiter(extra.keys(), dtype=np.int64, count=len(extra))
+    weights = np.fromiter(extra.values(), dtype=np.float64, count=len(extra))
+    # Keep only words that have examples and a weight above the base
+    word_index = np.searchsorted(csr.word_ids, word_ids)
+    present = (word_index < len(csr.word_ids)) & (weights > 0)
+    present[present] = csr.word_ids[word_index[present]] == word_ids[present]
+    word_index, weights = word_index[present], weights[present]
+    prob, alias = build_alias_table(weights)
+    overlay = _SkillOverlay(word_index, prob, alias, float(weights.sum()))
+    _overlay_cache.put(key, overlay)
+    return overlay
+
+
+def _recommend_from_graph(csr: CSR, csr_key: tuple, limit_examples: int, db: Session, user_id: str) -> List[ExampleOut]:
+    """
+    Cost is O(k) per request instead of O(|words|).
+    Every word with examples has base weight 1 (a word without a skill row counts as
+    reading 100, i.e. weight 1). The user's skilled words add (weight - 1) on top, as
+    a sparse overlay sampled through an alias table cached per skill version.
+    A draw comes from the base with probability n / (n + extra) and from the overlay otherwise.
+    """
+    n = len(csr.word_ids)
+    if n == 0:
+        return []
+    overlay = _skill_overlay(csr, csr_key, db, user_id)
+
+    rng = np.random.default_rng()
+    k = min(limit_examples * 4, n)  # buffer to offset duplicates
+    word_index = rng.integers(n, size=k)
+    from_overlay = rng.random(k) * (n + overlay.extra_total) >= n
+    num_overlay = int(from_overlay.sum())
+    if num_overlay:
+        word_index[from_overlay] = overlay.word_index[alias_sample(overlay.prob, overlay.alias, num_overlay, rng)]
+    # Keep draw order, drop duplicate examples
+    drawn_ids = list(dict.fromkeys(sample_examples_of(csr, word_index, rng).tolist()))
+
+    rows = db.execute(
+        select(
+            Example.id,
+            Example.jp_text,
+            Example.kr_mean,
+            Example.en_prompt,
+            Example.audio_object_key,
+            Example.image_object_key,
+            Example.tags,
+        )
+        .where(Example.id.in_(drawn_ids))
+    ).all()
+    rows_by_id = {row.id: row for row in rows}
     chosen_examples = []
-    seen_example_ids = set()
-
-    # 3) Sample words with replacement using weights, then pick random example per word
-    sample_size = min(limit_examples * 4, len(words))  # buffer to offset duplicates
-    for word_id in random.choices(words, weights=weights, k=sample_size):
-        stmt = (
-            select(
-                Example.id,
-                Example.jp_text,
-                Example.kr_mean,
-                Example.en_prompt,
-                Example.audio_object_key,
-                Example.image_object_key,
-                Example.tags,
+    for example_id in drawn_ids:
+        example_row = rows_by_id.get(example_id)  # missing if deleted since the last refresh
+        if example_row is None:
+            continue
+        chosen_examples.append(
+            ExampleOut(
+                id=example_row.id,
+                jp_text=example_row.jp_text,
+                kr_mean=example_row.kr_mean,
+                en_prompt=example_row.en_prompt,
+                audio_url=presign_get_url(example_row.audio_object_key, expires=600)
+                if example_row.audio_object_key
+                else None,
+                image_url=presign_get_url(example_row.image_object_key, expires=600)
+                if example_row.image_object_key
+                else None,
+                tags=example_row.tags,
             )
-            .select_from(Example)
-            .join(WordExample, WordExample.example_id == Example.id)
-            .where(WordExample.word_id == word_id)
         )
-
-        if tag_filters:
-            stmt = stmt.where(or_(*tag_filters))
-
-        example_row = db.execute(
-            stmt.order_by(func.random()).limit(1)
-        ).first()
-
-        if example_row and example_row.id not in seen_example_ids:
-            seen_example_ids.add(example_row.id)
-            chosen_examples.append(
-                ExampleOut(
-                    id=example_row.id,
-                    jp_text=example_row.jp_text,
-                    kr_mean=example_row.kr_mean,
-                    en_prompt=example_row.en_prompt,
-                    audio_url=presign_get_url(example_row.audio_object_key, expires=600)
-                    if example_row.audio_object_key
-                    else None,
-                    image_url=presign_get_url(example_row.image_object_key, expires=600)
-                    if example_row.image_object_key
-                    else None,
-                    tags=example_row.tags,
-                )
-            )
-
         if len(chosen_examples) >= limit_examples:
             break
-
     return chosen_examples
@@ -0,0 +1,249 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from models import ExampleOut
+from settings import settings
+from methods.tag_index import tag_index
+from methods.word_example_graph import bitmap_contains
+from methods.recommend_examples_simple import recommend_examples_simple
+from methods.recommend_examples_worst_reading import recommend_examples_worst_reading
+from methods.recommend_examples_due import recommend_examples_due
+from methods.recommend_examples_interest import recommend_examples_interest
+
+logger = logging.getLogger(__name__)
+
+
+class Recommender(NamedTuple):
+    name: str
+    fn: Callable[..., List[ExampleOut]]  # fn(limit_examples, tags, db, user_id)
+    budget_ms: int                       # 0이면 예산 없이 요청 스레드에서 바로 실행
+    needs_user: bool
+
+
+class _AlgorithmStats:
+    def __init__(self):
+        self.calls = 0
+        self.budget_misses = 0
+        self.saturated = 0  # 워커가 모두 바빠 주 알고리즘을 건너뛴 횟수
+        self.errors = 0
+        self.fallbacks = 0
+        self.latencies_ms = deque(maxlen=1024)  # 최근 호출의 주 알고리즘 지연 (예산 초과 시 예산값)
+
+    def to_dict(self) -> dict:
+        latencies = np.asarray(self.latencies_ms, dtype=np.float64)
+        p50, p95 = np.percentile(latencies, [50, 95]) if len(latencies) else (0.0, 0.0)
+        return {
+            "calls": self.calls,
+            "budget_misses": self.budget_misses,
+            "saturated": self.saturated,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": round(self.fallbacks / self.calls, 4) if self.calls else 0.0,
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+        }
+
+
+class FallbackPool:
+    """
+    예산을 넘긴 요청에 바로 내줄 무작위 예문 풀 (프로세스 로컬, ExampleOut 그대로 보관).
+    FALLBACK_POOL_TTL_SEC마다 recommend_examples_simple로 다시 뽑는다 (presign URL 만료 전에 교체).
+    다시 뽑다 실패하면 기존 풀을 그대로 쓴다.
+    태그가 있으면 풀에서 태그 인덱스로 거르고, 모자라면 recommend_examples_simple을 직접 부른다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.examples: List[ExampleOut] = []
+        self._built_at = 0.0
+
+    def _ensure(self, db: Session):
+        with self._lock:
+            if self.examples and time.monotonic() - self._built_at < settings.FALLBACK_POOL_TTL_SEC:
+                return
+            try:
+                self.examples = recommend_examples_simple(limit_examples=settings.FALLBACK_POOL_SIZE, db=db)
+            except Exception:
+                if not self.examples:
+                    raise
+                logger.exception("fallback pool refresh failed; keeping %d examples", len(self.examples))
+            self._built_at = time.monotonic()
+
+    def sample(self, limit_examples: int, tags: Optional[List[str]], db: Session) -> List[ExampleOut]:
+        self._ensure(db)
+        candidates = self.examples
+        if tags:
+            tag_index.ensure_fresh(db)
+            matched = tag_index.lookup(tags)
+            if matched is not None:
+                ids = np.fromiter((example.id for example in candidates), dtype=np.int64, count=len(candidates))
+                keep = bitmap_contains(matched[1], ids)
+                candidates = [example for example, ok in zip(candidates, keep) if ok]
+            if len(candidates) < limit_examples:
+                return recommend_examples_simple(limit_examples=limit_examples, tags=tags, db=db)
+        if len(candidates) <= limit_examples:
+            return list(candidates)
+        picked = np.random.default_rng().choice(len(candidates), size=limit_examples, replace=False)
+        return [candidates[i] for i in picked]
+
+    def stats(self) -> dict:
+        return {"size": len(self.examples), "age_sec": round(time.monotonic() - self._built_at, 1) if self.examples else None}
+
+
+def _parse_budgets(spec: str) -> Dict[str, int]:
+    # "due=200,interest=400" -> {"due": 200, "interest": 400}
+    budgets = {}
+    for item in (spec or "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip():
+            budgets[name.strip()] = int(value)
+    return budgets
+
+
+_budget_overrides = _parse_budgets(settings.RECOMMEND_BUDGETS_MS)
+_registry: Dict[str, Recommender] = {}
+_stats: Dict[str, _AlgorithmStats] = {}
+_stats_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_inflight = 0  # 워커에 제출됐지만 아직 끝나지 않은 주 알고리즘 수 (_executor_lock으로 보호)
+fallback_pool = FallbackPool()
+
+
+def register_recommender(name: str, fn: Callable[..., List[ExampleOut]], needs_user: bool = True, budget_ms: Optional[int] = None) -> Recommender:
+    """추천 알고리즘을 이름으로 등록한다. 예산은 RECOMMEND_BUDGETS_MS > budget_ms > RECOMMEND_BUDGET_MS 순으로 정한다."""
+    if name in _budget_overrides:
+        budget_ms = _budget_overrides[name]
+    elif budget_ms is None:
+        budget_ms = settings.RECOMMEND_BUDGET_MS
+    recommender = Recommender(name, fn, budget_ms, needs_user)
+    _registry[name] = recommender
+    with _stats_lock:
+        _stats.setdefault(name, _AlgorithmStats())
+    return recommender
+
+
+def recommenders() -> Dict[str, Recommender]:
+    return dict(_registry)
+
+
+def get_recommender(name: Optional[str], user_id: Optional[str]) -> Recommender:
+    """
+    요청에서 고른 이름 -> 등록된 알고리즘. 없거나 모르는 이름이면 설정의 기본값
+    (비로그인이면 RECOMMEND_ANONYMOUS). 로그인이 필요한 알고리즘을 비로그인으로 고르면 익명용으로 바꾼다.
+    """
+    recommender = _registry.get(name) if name else None
+    if recommender is None:
+        recommender = _registry[settings.RECOMMEND_DEFAULT if user_id is not None else settings.RECOMMEND_ANONYMOUS]
+    if recommender.needs_user and user_id is None:
+        recommender = _registry[settings.RECOMMEND_ANONYMOUS]
+    return recommender
+
+
+def _submit(fn, *args) -> Optional[Future]:
+    """
+    워커에 주 알고리즘을 제출한다. 모든 워커가 바쁘면 제출하지 않고 None을 돌려준다
+    (큐에서 기다리다 예산을 넘기는 요청이 쌓이지 않도록).
+    """
+    global _executor, _inflight
+    with _executor_lock:
+        if _inflight >= settings.RECOMMEND_WORKERS:
+            return None
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.RECOMMEND_WORKERS, thread_name_prefix="recommend")
+        _inflight += 1
+        future = _executor.submit(fn, *args)
+    future.add_done_callback(_on_done)
+    return future
+
+
+def _on_done(future: Future) -> None:
+    global _inflight
+    with _executor_lock:
+        _inflight -= 1
+
+
+def _run_in_own_session(fn, limit_examples: int, tags: Optional[List[str]], user_id: Optional[str]) -> List[ExampleOut]:
+    # 예산을 넘기면 요청 세션으로 fallback을 돌리므로, 주 알고리즘은 별도 세션에서 실행한다
+    db = SessionLocal()
+    try:
+        return fn(limit_examples, tags, db, user_id)
+    finally:
+        db.close()
+
+
+def recommend(
+    name: Optional[str],
+    limit_examples: int,
+    tags: Optional[List[str]] = None,
+    db: Session = None,
+    user_id: str = None
+) -> List[ExampleOut]:
+    """
+    고른 알고리즘을 예산 안에서 실행하고, 예산 초과/워커 포화/오류면 fallback_pool에서 답한다.
+    예산을 넘긴 계산은 아직 시작 전이면 취소되고, 이미 실행 중이면 끝까지 돈 뒤 버려진다.
+    """
+    recommender = get_recommender(name, user_id)
+    stats = _stats[recommender.name]
+    started = time.perf_counter()
+    examples = None
+    with _stats_lock:
+        stats.calls += 1
+    future = None
+    try:
+        if recommender.budget_ms > 0:
+            future = _submit(_run_in_own_session, recommender.fn, limit_examples, tags, user_id)
+            if future is None:
+                with _stats_lock:
+                    stats.saturated += 1
+            else:
+                examples = future.result(timeout=recommender.budget_ms / 1000)
+        else:
+            examples = recommender.fn(limit_examples, tags, db, user_id)
+    except FutureTimeoutError:
+        future.cancel()
+        with _stats_lock:
+            stats.budget_misses += 1
+    except Exception:
+        logger.exception("recommender %s failed", recommender.name)
+        with _stats_lock:
+            stats.errors += 1
+    with _stats_lock:
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+    if examples is None:
+        with _stats_lock:
+            stats.fallbacks += 1
+        examples = fallback_pool.sample(limit_examples, tags, db)
+    return examples
+
+
+def recommender_stats() -> dict:
+    with _stats_lock:
+        algorithms = {name: stats.to_dict() for name, stats in _stats.items()}
+    return {
+        "budgets_ms": {name: recommender.budget_ms for name, recommender in _registry.items()},
+        "algorithms": algorithms,
+        "fallback_pool": fallback_pool.stats(),
+    }
+
+
+def shutdown_recommenders() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+register_recommender("simple", recommend_examples_simple, needs_user=False)
+register_recommender("worst_reading", recommend_examples_worst_reading)
+register_recommender("due", recommend_examples_due)
+register_recommender("interest", recommend_examples_interest)
@@ -0,0 +1,95 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+def word_entry(lemma_id, words_dict, words_existing) -> Optional[Dict[str, Any]]:
+    """토큰 하나를 표시할 단어 정보 (surface 제외). 표시하지 않는 토큰이면 None."""
+    if lemma_id in words_existing:
+        w = words_existing[lemma_id]
+        return {
+            "word_id": w["id"],
+            "lemma_id": w["lemma_id"],
+            "lemma": w["lemma"],
+            "user_id": w["user_id"],
+            "user_display_name": w["user"]["display_name"],
+            "jp_pron": w["jp_pron"],
+            "kr_pron": w["kr_pron"],
+            "kr_mean": w["kr_mean"],
+            "level": w["level"],
+            "user_word_skills": w["user_word_skills"],
+            "num_user_word_skills": w["num_learners"],
+            "avg_reading": w["avg_reading"],
+        }
+    if lemma_id in words_dict and words_dict[lemma_id].lemma != "":
+        w = words_dict[lemma_id]
+        return {
+            "word_id": None,
+            "lemma_id": w.lemma_id,
+            "lemma": w.lemma,
+            "user_id": None,
+            "user_display_name": None,
+            "jp_pron": w.pronBase,
+            "kr_pron": w.pos1,
+            "kr_mean": w.type,
+            "level": None,
+            "user_word_skills": [],
+            "num_user_word_skills": 0,
+            "avg_reading": None,
+        }
+    return None
+
+
+def _surface(surface: str, entry: Dict[str, Any], pad_empty_lemma: bool) -> str:
+    if pad_empty_lemma and entry["lemma"] == "":
+        return " " + surface
+    return surface
+
+
+def render_words(document, words_dict, words_existing, line_offset: int = 0,
+                 pad_empty_lemma: bool = True) -> Dict[int, List[Dict[str, Any]]]:
+    words_result = defaultdict(list)
+    entries = {}
+    for i_line, line in enumerate(document, start=line_offset):
+        for word in line:
+            lemma_id = word["lemma_id"]
+            if lemma_id not in entries:
+                entries[lemma_id] = word_entry(lemma_id, words_dict, words_existing)
+            entry = entries[lemma_id]
+            if entry is None:
+                continue
+            words_result[i_line].append({**entry, "surface": _surface(word["surface"], entry, pad_empty_lemma)})
+    return words_result
+
+
+class CompactLexicon:
+    """
+    compact 응답용 단어 테이블. 같은 lemma는 한 번만 담고 토큰은 테이블 인덱스로 가리킨다.
+    하나의 응답(본문 + 예문) 안에서 공유한다.
+    """
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self._index: Dict[Any, Optional[int]] = {}
+
+    def index_of(self, lemma_id, words_dict, words_existing) -> Optional[int]:
+        if lemma_id not in self._index:
+            entry = word_entry(lemma_id, words_dict, words_existing)
+            if entry is None:
+                self._index[lemma_id] = None
+            else:
+                self._index[lemma_id] = len(self.entries)
+                self.entries.append(entry)
+        return self._index[lemma_id]
+
+
+def render_words_compact(document, words_dict, words_existing, lexicon: CompactLexicon,
+                         line_offset: int = 0, pad_empty_lemma: bool = True) -> Dict[int, List[List[Any]]]:
+    """줄 번호 -> [[surface, lexicon 인덱스], ...]"""
+    lines = defaultdict(list)
+    for i_line, line in enumerate(document, start=line_offset):
+        for word in line:
+            index = lexicon.index_of(word["lemma_id"], words_dict, words_existing)
+            if index is None:
+                continue
+            lines[i_line].append([_surface(word["surface"], lexicon.entries[index], pad_empty_lemma), index])
+    return lines
@@ -0,0 +1,68 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db import UserWordSkill
+from methods.lexicon_snapshot import WordRecord, lexicon_snapshot
+from methods.word_skill_stats import load_word_skill_stats
+
+
+def row_to_dict(obj) -> dict:
+    # ORM 객체를 dict로 안전하게 변환
+    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+
+
+def load_words_existing(lemma_ids: Iterable[Optional[int]], db: Session, user_id: str = None,
+                        word_records: Optional[Dict[int, WordRecord]] = None) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+    """
+    lemma_id 목록을 단어와 매칭하고 요청한 사용자의 숙련도를 붙인다.
+    다른 사용자 정보는 개별 행 대신 word_skill_stats 집계(학습자 수, 평균 reading)만 사용하므로
+    응답 크기가 전체 사용자 수와 무관하다.
+    word_records가 주어지면 (분석 캐시에서 이미 매칭한 경우) 스냅샷 매칭을 건너뛴다.
+    Returns: (lemma_id -> word dict, 숙련도 낮은 word_id 목록)
+    """
+    if word_records is None:
+        # words 테이블 대신 프로세스 로컬 스냅샷에서 매칭 (내 것이 먼저 선택됨)
+        lexicon_snapshot.ensure_fresh(db)
+        word_records = lexicon_snapshot.resolve(lemma_ids, user_id)
+    word_ids = [record.id for record in word_records.values()]
+
+    skills_by_word_id = defaultdict(list)
+    if user_id is not None and word_ids:
+        user_word_skills = db.execute(
+            select(UserWordSkill)
+            .where(UserWordSkill.user_id == user_id, UserWordSkill.word_id.in_(word_ids))
+        ).scalars().all()
+        for skill in user_word_skills:
+            skills_by_word_id[skill.word_id].append(row_to_dict(skill))
+    stats_by_word_id = load_word_skill_stats(word_ids, db)
+
+    words_existing = {}
+    word_ids_not_mastered = []
+    for lemma_id, record in word_records.items():
+        skills = skills_by_word_id.get(record.id, [])
+        stats = stats_by_word_id.get(record.id, {"num_learners": 0, "avg_reading": None})
+        if user_id is not None:
+            not_mastered = any((skill["reading"] or 0) < 80 for skill in skills)
+        else:
+            # 비로그인: 다른 학습자들의 평균 숙련도 기준
+            not_mastered = stats["avg_reading"] is not None and stats["avg_reading"] < 80
+        if not_mastered:
+            word_ids_not_mastered.append(record.id)
+        words_existing[lemma_id] = {
+            "id": record.id,
+            "user_id": record.user_id,
+            "lemma_id": record.lemma_id,
+            "lemma": record.lemma,
+            "jp_pron": record.jp_pron,
+            "kr_pron": record.kr_pron,
+            "kr_mean": record.kr_mean,
+            "level": record.level,
+            "user_word_skills": skills,
+            "num_learners": stats["num_learners"],
+            "avg_reading": stats["avg_reading"],
+            "user": {"display_name": record.user_display_name}
+        }
+    return words_existing, word_ids_not_mastered
@@ -0,0 +1,30 @@
+import threading
+from typing import Dict, Optional
+
+
+class SkillVersions:
+    """
+    사용자별 숙련도 버전 카운터 (프로세스 로컬).
+    UserWordSkill을 바꾼 뒤 bump()하면 그 사용자의 분석 캐시 overlay가 무효화된다.
+    비로그인 분석은 다른 학습자 집계에 의존하므로 누구의 숙련도가 바뀌어도 올라가는 aggregate 버전을 쓴다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self.aggregate = 0
+
+    def get(self, user_id: Optional[str]) -> int:
+        if user_id is None:
+            return self.aggregate
+        with self._lock:
+            return self._versions.get(str(user_id), 0)
+
+    def bump(self, user_id: Optional[str]) -> None:
+        with self._lock:
+            if user_id is not None:
+                self._versions[str(user_id)] = self._versions.get(str(user_id), 0) + 1
+            self.aggregate += 1
+
+
+skill_versions = SkillVersions()
@@ -0,0 +1,99 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from db import ExampleTag, Tag
+from settings import settings
+from utils.lru_cache import LRUCache
+from methods.example_tags import normalize_tag
+
+
+class TagIndex:
+    """
+    태그 -> example_id 목록의 프로세스 로컬 인덱스.
+    검색어는 기존 ilike '%tag%'와 같이 태그 이름의 부분 문자열로 매칭하되,
+    비교 대상은 (작은) 태그 사전뿐이고 예문 집합은 미리 만든 배열/비트맵으로 합친다.
+    example_tags의 (행 수, 최종 변경 시각)이 바뀌면 다시 적재한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids_by_tag: Dict[str, np.ndarray] = {}
+        self._signature = None
+        self._refreshed_at = 0.0
+        self.version = 0
+        # (검색어 tuple, version) -> (정렬된 example_id 배열, example_id로 인덱싱하는 bool 비트맵)
+        self._query_cache = LRUCache(256)
+
+    def _current_signature(self, db: Session):
+        return tuple(db.execute(
+            select(func.count(), func.max(ExampleTag.updated_at)).select_from(ExampleTag)
+        ).one())
+
+    def load(self, db: Session, signature=None):
+        rows = db.execute(
+            select(Tag.name, ExampleTag.example_id).join(ExampleTag, ExampleTag.tag_id == Tag.id)
+        ).all()
+        grouped: Dict[str, list] = {}
+        for row in rows:
+            grouped.setdefault(row.name, []).append(row.example_id)
+        ids_by_tag = {name: np.unique(np.asarray(ids, dtype=np.int64)) for name, ids in grouped.items()}
+        with self._lock:
+            self._ids_by_tag = ids_by_tag
+            self._signature = signature if signature is not None else self._current_signature(db)
+            self._refreshed_at = time.monotonic()
+            self.version += 1
+        self._query_cache.clear()
+
+    def refresh(self, db: Session):
+        signature = self._current_signature(db)
+        if signature != self._signature:
+            self.load(db, signature)
+        else:
+            self._refreshed_at = time.monotonic()
+
+    def invalidate(self):
+        # 이 프로세스에서 태그를 바꾼 직후: 다음 조회 때 바로 다시 적재한다
+        self._signature = None
+        self._refreshed_at = 0.0
+
+    def ensure_fresh(self, db: Session):
+        if time.monotonic() - self._refreshed_at > settings.TAG_INDEX_REFRESH_SEC:
+            self.refresh(db)
+
+    def lookup(self, tags: Optional[Iterable[str]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        검색어 중 하나라도 이름에 포함하는 태그가 붙은 예문 (OR).
+        Returns: (정렬된 example_id 배열, bool 비트맵) / 검색어가 없으면 None
+        """
+        terms = tuple(sorted({normalize_tag(tag) for tag in tags or [] if tag and normalize_tag(tag)}))
+        if not terms:
+            return None
+        key = (terms, self.version)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            postings = [ids for name, ids in self._ids_by_tag.items() if any(term in name for term in terms)]
+        example_ids = np.unique(np.concatenate(postings)) if postings else np.empty(0, dtype=np.int64)
+        bitmap = np.zeros(int(example_ids[-1]) + 1 if len(example_ids) else 0, dtype=bool)
+        bitmap[example_ids] = True
+        result = (example_ids, bitmap)
+        self._query_cache.put(key, result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tags": len(self._ids_by_tag),
+                "links": int(sum(len(ids) for ids in self._ids_by_tag.values())),
+                "version": self.version,
+                "queries": self._query_cache.stats(),
+            }
+
+
+tag_index = TagIndex()
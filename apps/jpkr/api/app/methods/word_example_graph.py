@@ -0,0 +1,172 @@
+import threading
+import time
+from datetime import timedelta
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from db import WordExample
+from settings import settings
+from utils.lru_cache import LRUCache
+from methods.example_tags import normalize_tag
+from methods.tag_index import tag_index
+
+
+class CSR(NamedTuple):
+    word_ids: np.ndarray     # 예문이 있는 word_id (오름차순)
+    offsets: np.ndarray      # word_ids[i]의 예문은 example_ids[offsets[i]:offsets[i + 1]]
+    example_ids: np.ndarray
+
+
+def _pack(word_ids, example_ids) -> np.ndarray:
+    # (word_id, example_id) 쌍을 하나의 int64 키로: 정렬하면 word_id 순, 같은 단어 안에서는 example_id 순
+    return (np.asarray(word_ids, dtype=np.int64) << 32) | np.asarray(example_ids, dtype=np.int64)
+
+
+class WordExampleGraph:
+    """
+    word_examples 테이블의 프로세스 로컬 CSR 스냅샷 (word -> examples).
+    추천 시 단어/예문 선택을 DB 조회 없이 배열 인덱싱만으로 처리한다.
+    WordExample.updated_at 기준으로 증분 갱신하고, 삭제/병합은 행 수 비교로 감지해 전체 재적재한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = np.empty(0, dtype=np.int64)
+        self.csr = CSR(np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64))
+        self._watermark = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+        self.version = 0
+
+    def _set_keys(self, keys: np.ndarray):
+        # 호출하는 쪽에서 lock을 잡는다. csr은 통째로 교체하므로 읽는 쪽은 lock 없이 참조를 잡고 쓰면 된다
+        self._keys = keys
+        words = keys >> 32
+        word_ids, starts = np.unique(words, return_index=True)
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+        self.csr = CSR(word_ids, offsets, keys & 0xFFFFFFFF)
+        self.version += 1
+
+    def _max_updated(self, rows):
+        for row in rows:
+            if self._watermark is None or row.updated_at > self._watermark:
+                self._watermark = row.updated_at
+
+    def load(self, db: Session):
+        rows = db.execute(select(WordExample.word_id, WordExample.example_id, WordExample.updated_at)).all()
+        with self._lock:
+            self._watermark = None
+            self._max_updated(rows)
+            self._set_keys(np.unique(_pack([r.word_id for r in rows], [r.example_id for r in rows])))
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+    def refresh(self, db: Session):
+        """updated_at 워터마크 이후 생긴/바뀐 연결만 다시 읽는다."""
+        if not self._loaded:
+            self.load(db)
+            return
+        with self._lock:
+            watermark = self._watermark
+        stmt = select(WordExample.word_id, WordExample.example_id, WordExample.updated_at)
+        if watermark is not None:
+            stmt = stmt.where(WordExample.updated_at >= watermark - timedelta(seconds=settings.LEXICON_REFRESH_OVERLAP_SEC))
+        rows = db.execute(stmt).all()
+        total = db.execute(select(func.count()).select_from(WordExample)).scalar_one()
+        with self._lock:
+            self._max_updated(rows)
+            if rows:
+                keys = np.union1d(self._keys, _pack([r.word_id for r in rows], [r.example_id for r in rows]))
+                if len(keys) != len(self._keys):
+                    self._set_keys(keys)
+            self._refreshed_at = time.monotonic()
+            needs_reload = total != len(self._keys)
+        if needs_reload:
+            # 다른 프로세스에서 삭제/병합된 연결이 있음
+            self.load(db)
+
+    def add_links(self, links: Iterable[Tuple[int, int]]):
+        """이 프로세스에서 커밋한 새 연결을 바로 반영한다. (아직 적재 전이면 무시)"""
+        links = list(links)
+        if not links or not self._loaded:
+            return
+        with self._lock:
+            self._set_keys(np.union1d(self._keys, _pack([w for w, _ in links], [e for _, e in links])))
+
+    def remove(self, word_ids: Iterable[int] = (), example_ids: Iterable[int] = ()):
+        word_ids = np.asarray(list(word_ids), dtype=np.int64)
+        example_ids = np.asarray(list(example_ids), dtype=np.int64)
+        if not self._loaded or (len(word_ids) == 0 and len(example_ids) == 0):
+            return
+        with self._lock:
+            keys = self._keys
+            drop = np.isin(keys >> 32, word_ids) | np.isin(keys & 0xFFFFFFFF, example_ids)
+            if drop.any():
+                self._set_keys(keys[~drop])
+
+    def ensure_fresh(self, db: Session):
+        if not self._loaded or time.monotonic() - self._refreshed_at > settings.EXAMPLE_GRAPH_REFRESH_SEC:
+            self.refresh(db)
+
+    def stats(self) -> dict:
+        csr = self.csr
+        return {
+            "words": len(csr.word_ids),
+            "links": len(csr.example_ids),
+            "version": self.version,
+            "watermark": self._watermark,
+        }
+
+
+def sample_examples_of(csr: CSR, word_index: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """csr.word_ids[word_index] 각각에 대해 연결된 예문 하나를 균등하게 고른다 (벡터화)."""
+    starts = csr.offsets[word_index]
+    degrees = csr.offsets[word_index + 1] - starts
+    return csr.example_ids[starts + (rng.random(len(word_index)) * degrees).astype(np.int64)]
+
+
+def bitmap_contains(bitmap: np.ndarray, example_ids: np.ndarray) -> np.ndarray:
+    """example_ids 각각이 비트맵에 있는지 (비트맵 길이를 넘는 id는 False)"""
+    inside = example_ids < len(bitmap)
+    result = np.zeros(len(example_ids), dtype=bool)
+    result[inside] = bitmap[example_ids[inside]]
+    return result
+
+
+def restrict_csr(csr: CSR, example_bitmap: np.ndarray) -> CSR:
+    """비트맵에 있는 예문으로 가는 연결만 남긴 CSR (예: 태그 필터). 연결이 없어진 단어는 빠진다."""
+    keep = bitmap_contains(example_bitmap, csr.example_ids)
+    words = np.repeat(csr.word_ids, np.diff(csr.offsets))[keep]
+    word_ids, starts = np.unique(words, return_index=True)
+    return CSR(word_ids, np.append(starts, len(words)).astype(np.int64), csr.example_ids[keep])
+
+
+word_example_graph = WordExampleGraph()
+
+
+# (graph version, tag index version, tags) -> CSR with only tag-matching links
+_restricted_cache = LRUCache(64)
+
+
+def csr_for_tags(tags: Optional[List[str]], db: Session) -> Tuple[CSR, tuple]:
+    """
+    추천용 그래프: 태그가 주어지면 태그 인덱스로 해당 예문 연결만 남긴 CSR (캐시).
+    Returns: (CSR, 캐시 키로 쓸 수 있는 버전 tuple)
+    """
+    word_example_graph.ensure_fresh(db)
+    csr, key = word_example_graph.csr, (word_example_graph.version,)
+    if not tags:
+        return csr, key
+    tag_index.ensure_fresh(db)
+    matched = tag_index.lookup(tags)
+    if matched is None:
+        return csr, key
+    key = (word_example_graph.version, tag_index.version, tuple(sorted({normalize_tag(tag) for tag in tags if tag})))
+    restricted = _restricted_cache.get(key)
+    if restricted is None:
+        restricted = restrict_csr(csr, matched[1])
+        _restricted_cache.put(key, restricted)
+    return restricted, key
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, insert, literal, func
+from sqlalchemy.orm import Session
+
+from db import UserWordSkill, UserWordSchedule
+
+
+def quality_from_reading(reading: Optional[int]) -> int:
+    """reading 숙련도(0~100)를 SM-2 응답 품질(0~5)로 변환"""
+    return max(0, min(5, round((reading or 0) / 20)))
+
+
+def next_schedule(schedule: UserWordSchedule, quality: int, now: datetime) -> None:
+    """SM-2: 응답 품질로 반복 횟수/간격/ease를 갱신하고 다음 복습 시각을 정한다."""
+    if quality < 3:
+        schedule.repetitions = 0
+        schedule.interval_days = 1
+    else:
+        schedule.repetitions = (schedule.repetitions or 0) + 1
+        if schedule.repetitions == 1:
+            schedule.interval_days = 1
+        elif schedule.repetitions == 2:
+            schedule.interval_days = 6
+        else:
+            schedule.interval_days = round(schedule.interval_days * schedule.ease, 1)
+    schedule.ease = max(1.3, schedule.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    schedule.due_at = now + timedelta(days=schedule.interval_days)
+
+
+def schedule_review(skill: UserWordSkill, db: Session, now: Optional[datetime] = None) -> UserWordSchedule:
+    """
+    숙련도가 바뀐 UserWordSkill 한 행의 복습 일정을 다시 잡는다 (PK 조회 1회). (commit은 호출하는 쪽에서)
+    skill.id가 있어야 하므로 새 행이면 flush 후에 호출한다.
+    """
+    now = now or datetime.now(timezone.utc)
+    schedule = db.get(UserWordSchedule, skill.id)
+    if schedule is None:
+        schedule = UserWordSchedule(user_word_skill_id=skill.id, user_id=skill.user_id, interval_days=0, ease=2.5, repetitions=0)
+        db.add(schedule)
+    next_schedule(schedule, quality_from_reading(skill.reading), now)
+    return schedule
+
+
+def ensure_word_schedules(db: Session) -> int:
+    """일정이 없는 UserWordSkill (기능 추가 전 데이터 등) 에 '지금 복습' 일정을 만든다."""
+    missing = (
+        select(
+            UserWordSkill.id,
+            UserWordSkill.user_id,
+            func.now(),
+            literal(0.0),
+            literal(2.5),
+            literal(0),
+        )
+        .outerjoin(UserWordSchedule, UserWordSchedule.user_word_skill_id == UserWordSkill.id)
+        .where(UserWordSchedule.user_word_skill_id.is_(None))
+    )
+    result = db.execute(
+        insert(UserWordSchedule).from_select(
+            ["user_word_skill_id", "user_id", "due_at", "interval_days", "ease", "repetitions"],
+            missing,
+        )
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+def due_word_ids(user_id: str, db: Session, limit: int, now: Optional[datetime] = None) -> List[int]:
+    """복습 시각이 지난 단어를 오래 밀린 순으로 (user_id, due_at) 인덱스 범위 조회"""
+    now = now or datetime.now(timezone.utc)
+    return db.execute(
+        select(UserWordSkill.word_id)
+        .join(UserWordSchedule, UserWordSchedule.user_word_skill_id == UserWordSkill.id)
+        .where(UserWordSchedule.user_id == user_id, UserWordSchedule.due_at <= now)
+        .order_by(UserWordSchedule.due_at)
+        .limit(limit)
+    ).scalars().all()
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session
+
+from db import UserWordSkill, WordSkillStat
+
+
+def _aggregate_stmt():
+    return (
+        select(
+            UserWordSkill.word_id,
+            func.count(UserWordSkill.id).label("learners"),
+            func.coalesce(func.sum(UserWordSkill.reading), 0).label("reading_sum"),
+            func.coalesce(func.sum(UserWordSkill.listening), 0).label("listening_sum"),
+            func.coalesce(func.sum(UserWordSkill.speaking), 0).label("speaking_sum"),
+        )
+        .group_by(UserWordSkill.word_id)
+    )
+
+
+def refresh_word_skill_stats(word_ids: Iterable[int], db: Session) -> None:
+    """주어진 단어들의 집계만 UserWordSkill에서 다시 계산한다. (commit은 호출하는 쪽에서)"""
+    word_ids = set(word_ids)
+    if not word_ids:
+        return
+    db.flush()  # autoflush=False: 아직 flush 안 된 숙련도 변경도 집계에 반영
+    rows = db.execute(_aggregate_stmt().where(UserWordSkill.word_id.in_(word_ids))).all()
+    for row in rows:
+        db.merge(WordSkillStat(
+            word_id=row.word_id,
+            learners=row.learners,
+            reading_sum=row.reading_sum,
+            listening_sum=row.listening_sum,
+            speaking_sum=row.speaking_sum,
+        ))
+    empty_ids = word_ids - {row.word_id for row in rows}
+    if empty_ids:
+        db.execute(delete(WordSkillStat).where(WordSkillStat.word_id.in_(empty_ids)))
+
+
+def rebuild_word_skill_stats(db: Session) -> int:
+    """전체 재집계 (최초 적재용)."""
+    rows = db.execute(_aggregate_stmt()).all()
+    db.execute(delete(WordSkillStat))
+    db.add_all([
+        WordSkillStat(
+            word_id=row.word_id,
+            learners=row.learners,
+            reading_sum=row.reading_sum,
+            listening_sum=row.listening_sum,
+            speaking_sum=row.speaking_sum,
+        )
+        for row in rows
+    ])
+    db.commit()
+    return len(rows)
+
+
+def load_word_skill_stats(word_ids: Iterable[int], db: Session) -> Dict[int, Dict[str, Optional[float]]]:
+    """word_id -> {"num_learners", "avg_reading"}"""
+    word_ids = list(word_ids)
+    if not word_ids:
+        return {}
+    rows = db.execute(
+        select(WordSkillStat.word_id, WordSkillStat.learners, WordSkillStat.reading_sum)
+        .where(WordSkillStat.word_id.in_(word_ids))
+    ).all()
+    return {
+        row.word_id: {
+            "num_learners": row.learners,
+            "avg_reading": row.reading_sum / row.learners if row.learners else None,
+        }
+        for row in rows
+    }
+
+
+def ensure_word_skill_stats(db: Session) -> int:
+    """집계 테이블이 비어 있으면 (기능 추가 직후) 전체를 한 번 재집계한다."""
+    if db.execute(select(func.count()).select_from(WordSkillStat)).scalar_one() > 0:
+        return 0
+    return rebuild_word_skill_stats(db)
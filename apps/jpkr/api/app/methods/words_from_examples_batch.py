@@ -1,85 +1,37 @@
-from sqlalchemy.orm import Session, selectinload
-from typing import List, Dict, Any
-from collections import defaultdict
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional
 
-from db import Example, Word
-from utils.aws_s3 import presign_get_url
-from utils.words_from_text import extract_words_from_text
+from db import Example
+from methods.example_tokens import tokenize_examples
+from methods.resolve_words import load_words_existing
+from methods.render_words import CompactLexicon, render_words, render_words_compact
 
-def row_to_dict(obj) -> dict:
-    # ORM 객체를 dict로 안전하게 변환
-    return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
-
-def words_from_examples_batch(examples: List[Example], db: Session = None, user_id: str = None) -> Dict[int, Dict[str, Any]]:    
+def words_from_examples_batch(examples: List[Example], db: Session = None, user_id: str = None, lexicon: Optional[CompactLexicon] = None) -> Dict[int, Dict[str, Any]]:    
+    """
+    예문별 단어 정보를 붙여 반환한다.
+    lexicon이 주어지면 "words" 대신 lexicon 인덱스로 표현한 "lines"를 담는다 (compact 응답).
+    """
+    # 예문별 분석은 한 번만 수행하고 아래 렌더링 단계에서 재사용 (저장된 토큰 스트림 우선)
+    tokenized_list = tokenize_examples(examples, db)
     words_dict_global = {}
-    for i, example in enumerate(examples):
-        document, words_dict = extract_words_from_text(example.jp_text)
-        words_dict_global.update(words_dict)
-    words_existing = (db.query(Word)
-                    .options(selectinload(Word.user_word_skills),
-                            selectinload(Word.user)
-                        )
-                    .filter(Word.lemma_id.in_(list(words_dict_global.keys()))
-                                                            ).all())
-    words_dict_existing = {}
-    for w in words_existing:
-        if w.lemma_id and w.lemma_id not in words_dict_existing:
-            words_dict_existing[w.lemma_id] = row_to_dict(w)
-            words_dict_existing[w.lemma_id]["user_word_skills"] = []
-            words_dict_existing[w.lemma_id]["user"] = row_to_dict(w.user)
-            for user_word_skill in w.user_word_skills:
-                words_dict_existing[w.lemma_id]["user_word_skills"].append(row_to_dict(user_word_skill))
-
+    for tokenized in tokenized_list:
+        words_dict_global.update(tokenized.words)
+    # words 테이블 조회 대신 lexicon 스냅샷 사용, 요청한 사용자의 숙련도만 DB에서 읽는다
+    words_dict_existing, _ = load_words_existing(words_dict_global.keys(), db, user_id)
 
     examples_result = {}
-    for example in examples:
-        document, words_dict = extract_words_from_text(example.jp_text)
-
-        words_result = defaultdict(list)
-        for i_line, line in enumerate(document):
-            for i_word, word in enumerate(line):
-                surface = word["surface"]
-                lemma_id = word["lemma_id"]
-                if lemma_id in words_dict_existing:
-                    w = words_dict_existing[lemma_id]
-                    words_result[i_line].append({
-                        "word_id": w["id"],
-                        "lemma_id": w["lemma_id"],
-                        "lemma": w["lemma"],
-                        "user_id": w["user_id"],
-                        "user_display_name": w["user"]["display_name"],
-                        "surface": surface,
-                        "jp_pron": w["jp_pron"],
-                        "kr_pron": w["kr_pron"],
-                        "kr_mean": w["kr_mean"],
-                        "level": w["level"],
-                        "user_word_skills": w["user_word_skills"],
-                        "num_user_word_skills": len(w["user_word_skills"]),
-                    })
-                elif lemma_id in words_dict_global:
-                    if words_dict_global[lemma_id]["lemma"] != "":
-                        w = words_dict_global[lemma_id]
-                        words_result[i_line].append({
-                            "word_id": None,
-                            "lemma_id": w["lemma_id"],
-                            "lemma": w["lemma"],
-                            "user_id": None,
-                            "user_display_name": None,
-                            "surface": surface,
-                            "jp_pron": w["pronBase"],
-                            "kr_pron": w["pos1"],
-                            "kr_mean": w["type"],
-                            "level": None,
-                            "user_word_skills": [],
-                            "num_user_word_skills": 0,
-                        })
-        examples_result[example.id] = {
+    for example, tokenized in zip(examples, tokenized_list):
+        example_result = {
             "id": example.id,
             "jp_text": example.jp_text,
             "kr_mean": example.kr_mean,
             "tags": example.tags,
             "audio_url": example.audio_url,
             "image_url": example.image_url,
-            "words": words_result,
         }
-    return examples_result
\ No newline at end of file
+        if lexicon is not None:
+            example_result["lines"] = render_words_compact(tokenized.document, tokenized.words, words_dict_existing, lexicon, pad_empty_lemma=False)
+        else:
+            example_result["words"] = render_words(tokenized.document, tokenized.words, words_dict_existing, pad_empty_lemma=False)
+        examples_result[example.id] = example_result
+    return examples_result
@@ -98,6 +98,7 @@ class ExampleFilterData(BaseModel):
     has_embedding: Optional[bool] = None
     has_audio: Optional[bool] = None
     has_image: Optional[bool] = None
+    tags: Optional[List[str]] = None
     limit: Optional[int] = Field(None, ge=1)
     offset: Optional[int] = Field(None, ge=0)
 
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from models import ExampleCreate, ExampleUpdate, ExampleFilterData
 from service.admin.examples_crud import (
@@ -19,6 +19,9 @@ router = APIRouter(prefix="/examples", tags=["examples"])
 
 class ExamplesForUserRequest(BaseModel):
     tags: Optional[List[str]] = None
+    compact: bool = False
+    recommender: Optional[str] = None  # methods.recommender_registry에 등록된 이름 ("worst_reading", "due", "interest" ...). None이면 RECOMMEND_DEFAULT
+    engaged_example_ids: Optional[List[int]] = Field(default=None, max_length=100)  # 직전 배치에서 본 예문 (관심 벡터 갱신용)
 
 
 @router.post("/create/batch")
@@ -66,6 +69,9 @@ async def api_get_examples_for_user(
     user=Depends(require_roles(["*"])),
 ):
     print(payload.tags)
-    return get_examples_for_user(
-        tags=payload.tags, db=db, user_id=user.id if user else None
+    result = get_examples_for_user(
+        tags=payload.tags, db=db, user_id=user.id if user else None, compact=payload.compact,
+        recommender=payload.recommender, engaged_example_ids=payload.engaged_example_ids,
     )
+    db.commit()
+    return result
@@ -1,10 +1,18 @@
+from typing import List
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from models import TextData
-from service.analysis_text import analyze_text
+from service.analysis_text import analyze_text, analyze_texts_batch, analyze_text_stream
 from user_auth.routes import get_db
 from user_auth.utils.auth_wrapper import require_roles
+from utils.words_from_text import tagger_stats, line_cache_stats
+from methods.lexicon_snapshot import lexicon_snapshot
+from methods.analysis_cache import analysis_cache_stats
+from methods.recommender_registry import recommender_stats
+from service.feed_examples import feed_prefetch
 
 router = APIRouter(prefix="/text", tags=["text"])
 
@@ -12,7 +20,42 @@ router = APIRouter(prefix="/text", tags=["text"])
 @router.post("/analyze")
 async def api_analyze_text(
     text_data: TextData,
+    compact: bool = False,
     db: Session = Depends(get_db),
     user=Depends(require_roles(["*"])),
 ):
-    return analyze_text(text_data.text, db=db, user_id=user.id if user else None)
+    result = analyze_text(text_data.text, db=db, user_id=user.id if user else None, compact=compact)
+    db.commit()  # 예문 토큰 스트림 backfill 저장
+    return result
+
+
+@router.post("/analyze/batch")
+async def api_analyze_texts_batch(
+    texts_data: List[TextData],
+    compact: bool = False,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles(["*"])),
+):
+    result = analyze_texts_batch(
+        [text_data.text for text_data in texts_data], db=db, user_id=user.id if user else None, compact=compact
+    )
+    db.commit()  # 예문 토큰 스트림 backfill 저장
+    return result
+
+
+@router.post("/analyze/stream")
+async def api_analyze_text_stream(
+    text_data: TextData,
+    user=Depends(require_roles(["*"])),
+):
+    return StreamingResponse(
+        analyze_text_stream(text_data.text, user_id=user.id if user else None),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/stats")
+async def api_text_stats(
+    user=Depends(require_roles(["admin"])),
+):
+    return {"tagger": tagger_stats(), "line_cache": line_cache_stats(), "lexicon": lexicon_snapshot.stats(), "analysis_cache": analysis_cache_stats(), "feed_prefetch": feed_prefetch.stats(), "recommenders": recommender_stats()}
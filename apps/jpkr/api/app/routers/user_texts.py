@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from models import TextData
@@ -9,6 +9,7 @@ from service.user_text_crud import (
     get_user_text,
     get_user_text_list,
 )
+from service.user_text_analysis import analyze_user_text
 from user_auth.routes import get_db
 from user_auth.utils.auth_wrapper import require_roles
 
@@ -33,6 +34,20 @@ async def api_get_user_text(
     return await get_user_text(user_text_id, db=db, user_id=user.id)
 
 
+@router.get("/analyze/{user_text_id}")
+async def api_analyze_user_text(
+    user_text_id: int,
+    compact: bool = False,
+    db: Session = Depends(get_db),
+    user=Depends(require_roles(["admin", "user"])),
+):
+    result = analyze_user_text(user_text_id, db=db, user_id=user.id, compact=compact)
+    if result is None:
+        raise HTTPException(status_code=404, detail="User text not found")
+    db.commit()
+    return result
+
+
 @router.get("/all")
 async def api_get_user_text_list(
     limit: int | None = None,
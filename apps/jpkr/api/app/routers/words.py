@@ -76,7 +76,9 @@ async def api_get_random_words_to_learn(
     db: Session = Depends(get_db),
     user=Depends(require_roles(["admin", "user"])),
 ):
-    return get_random_words_to_learn(limit, db=db, user_id=user.id)
+    result = get_random_words_to_learn(limit, db=db, user_id=user.id)
+    db.commit()  # 다시 뽑은 예문 저수지 저장
+    return result
 
 
 @router.post("/filter")
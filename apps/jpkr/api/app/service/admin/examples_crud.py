@@ -4,14 +4,22 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from db import Example, WordExample, Word
 from models import ExampleCreate, ExampleUpdate
-from utils.words_from_text import extract_words_from_text
+from utils.words_from_text import tokenize
 from utils.aws_s3 import delete_object
+from methods.example_tokens import save_example_tokens
+from methods.lexicon_snapshot import lexicon_snapshot
+from methods.example_reservoir import add_to_reservoirs, refresh_example_reservoirs
+from methods.word_example_graph import word_example_graph
+from methods.example_tags import sync_example_tags
+from methods.tag_index import tag_index
+from methods.example_id_pool import example_id_pool
 
 def create_examples_batch(examples_data: List[ExampleCreate], db: Session=None, user_id:str = None):
+    # 형태소 분석은 예문당 한 번: 아래 WordExample 생성 시 그대로 사용
+    tokenized_list = [tokenize(example_data.jp_text) for example_data in examples_data]
     words_dict_global = {}
-    for example_data in examples_data:
-        document, words_dict = extract_words_from_text(example_data.jp_text)
-        words_dict_global.update(words_dict)
+    for tokenized in tokenized_list:
+        words_dict_global.update(tokenized.words)
 
     words_existing = db.query(Word).filter(Word.lemma_id.in_(list(words_dict_global.keys()))
                                             ).where(Word.user_id == user_id).all()
@@ -20,17 +28,17 @@ def create_examples_batch(examples_data: List[ExampleCreate], db: Session=None,
         if lemma_id == None:
             continue
         if lemma_id not in words_dict_existing:
-            pos = word_data["pos1"]
+            pos = word_data.pos1
             level = "N1"
             if pos in ["助詞", "記号", "助動詞","補助記号","接尾辞", "代名詞"]:
                 continue
             new_word = Word(
                 user_id=user_id,
                 lemma_id=lemma_id,
-                lemma=word_data["lemma"],
-                jp_pron=word_data["pronBase"],
-                kr_pron=word_data["pos1"],
-                kr_mean=word_data["type"],
+                lemma=word_data.lemma,
+                jp_pron=word_data.pronBase,
+                kr_pron=word_data.pos1,
+                kr_mean=word_data.type,
                 level=level,
             )
             db.add(new_word)
@@ -38,7 +46,8 @@ def create_examples_batch(examples_data: List[ExampleCreate], db: Session=None,
             words_dict_existing[lemma_id] = new_word.id
         else:
             pass
-    for example_data in examples_data:
+    new_links = []
+    for example_data, tokenized in zip(examples_data, tokenized_list):
         new_example = Example(
             user_id=user_id,
             tags=example_data.tags,
@@ -48,19 +57,26 @@ def create_examples_batch(examples_data: List[ExampleCreate], db: Session=None,
         )
         db.add(new_example)
         db.flush()  # ID 생성을 위해 flush                
-        document, words_dict = extract_words_from_text(example_data.jp_text)
-        for word_data in words_dict.values():
-            if word_data["lemma_id"] == None:
+        save_example_tokens(new_example.id, new_example.jp_text, tokenized, db)
+        sync_example_tags([(new_example.id, new_example.tags)], db)
+        for word_data in tokenized.words.values():
+            if word_data.lemma_id == None:
                 continue
-            if word_data["lemma_id"] not in words_dict_existing:
+            if word_data.lemma_id not in words_dict_existing:
                 continue
             new_word_example = WordExample(
-                word_id=words_dict_existing[word_data["lemma_id"]],
+                word_id=words_dict_existing[word_data.lemma_id],
                 example_id=new_example.id
             )
             db.add(new_word_example)
             db.flush()
+            new_links.append((new_word_example.word_id, new_example.id))
+    add_to_reservoirs(new_links, db)
     db.commit()
+    lexicon_snapshot.refresh(db)  # 새로 등록된 단어 반영
+    word_example_graph.add_links(new_links)
+    tag_index.invalidate()
+    example_id_pool.invalidate()
     return
 
 def update_examples_batch(examples_data: List[ExampleUpdate], db: Session=None, user_id:str = None):
@@ -69,7 +85,11 @@ def update_examples_batch(examples_data: List[ExampleUpdate], db: Session=None,
         if example:
             # 예문 데이터 업데이트
             example.user_id = user_id
+            if example.tags != example_data.tags:
+                sync_example_tags([(example.id, example_data.tags)], db)
             example.tags = example_data.tags
+            if example.jp_text != example_data.jp_text:
+                save_example_tokens(example.id, example_data.jp_text, tokenize(example_data.jp_text), db)
             example.jp_text = example_data.jp_text
             example.kr_mean = example_data.kr_mean
             example.en_prompt = example_data.en_prompt
@@ -77,6 +97,7 @@ def update_examples_batch(examples_data: List[ExampleUpdate], db: Session=None,
             # 해당 ID의 예문이 없는 경우
             raise Exception("Example not found")        
     db.commit()
+    tag_index.invalidate()
     return
         
 def delete_examples_batch(example_ids: List[int], db: Session=None, user_id:str = None):
@@ -88,7 +109,15 @@ def delete_examples_batch(example_ids: List[int], db: Session=None, user_id:str
             delete_object(audio_object_key)
         if image_object_key is not None:
             delete_object(image_object_key)
+    linked_word_ids = [
+        word_id for (word_id,) in
+        db.query(WordExample.word_id).filter(WordExample.example_id.in_(example_ids)).distinct().all()
+    ]
     deleted_count = db.query(Example).filter(Example.id.in_(example_ids)).delete(synchronize_session=False)
+    refresh_example_reservoirs(linked_word_ids, db)
     db.commit()
+    word_example_graph.remove(example_ids=example_ids)
+    tag_index.invalidate()
+    example_id_pool.invalidate()
     print(f"총 {deleted_count}개의 예문을 일괄 삭제했습니다.")
     return deleted_count
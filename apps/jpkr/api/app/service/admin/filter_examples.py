@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import func, case
+from sqlalchemy import func, case, select, or_, exists
 from sqlalchemy.orm import Session
 
-from db import Example, WordExample
+from db import Example, WordExample, ExampleTag, Tag
 from utils.aws_s3 import presign_get_url
+from methods.example_tags import normalize_tag
 
 
 def filter_examples_by_criteria(
@@ -14,6 +15,7 @@ def filter_examples_by_criteria(
     has_embedding: Optional[bool] = None,
     has_audio: Optional[bool] = None,
     has_image: Optional[bool] = None,
+    tags: Optional[List[str]] = None,
     limit: Optional[int] = None,
     offset: Optional[int] = None,
     db: Session = None,
@@ -35,6 +37,18 @@ def filter_examples_by_criteria(
         case((Example.image_object_key.isnot(None), 1), else_=0).label("has_image"),
     )
 
+    # 태그 필터링 (검색어를 이름에 포함하는 태그를 tags에서 찾고, example_tags EXISTS로 거른다)
+    terms = {normalize_tag(tag) for tag in tags or [] if tag and normalize_tag(tag)}
+    if terms:
+        tag_ids = db.execute(
+            select(Tag.id).where(or_(*[Tag.name.contains(term, autoescape=True) for term in terms]))
+        ).scalars().all()
+        if not tag_ids:
+            return {"examples": [], "total_count": 0}
+        query = query.filter(
+            exists().where(ExampleTag.example_id == Example.id, ExampleTag.tag_id.in_(tag_ids))
+        )
+
     # 단어 수 필터링
     if min_words is not None or max_words is not None:
         example_count_subquery = (
@@ -6,6 +6,8 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from models import WordUpdate
 from db import Word
+from methods.lexicon_snapshot import lexicon_snapshot
+from methods.word_example_graph import word_example_graph
 
 def row_to_dict(obj) -> dict:
     # ORM 객체를 dict로 안전하게 변환
@@ -30,6 +32,7 @@ def update_words_batch(words_data: List[WordUpdate], db: Session=None, user_id:s
             # 해당 ID의 단어가 없는 경우
             result[word_data.id] = {"error": "Word not found"}    
     db.commit()
+    lexicon_snapshot.refresh(db)
     return result
         
 
@@ -44,6 +47,8 @@ def delete_words_batch(word_ids: Sequence[int], db: Session, user_id: str) -> Di
     )
     deleted_ids = set(db.execute(stmt).scalars().all())
     db.commit()
+    lexicon_snapshot.remove(deleted_ids)
+    word_example_graph.remove(word_ids=deleted_ids)
     return {wid: ("deleted" if wid in deleted_ids else "not found") for wid in word_ids}
 
 
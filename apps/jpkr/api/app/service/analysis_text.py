@@ -1,80 +1,49 @@
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Tuple
 from random import shuffle
 from collections import defaultdict
-from db import SessionLocal, Word, WordExample, UserWordSkill, Example
+from db import SessionLocal, Example
 from user_auth.db import User
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, case, func
 from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
 from utils.aws_s3 import presign_get_url
 from models import ExampleOut
+from settings import settings
 
-from utils.words_from_text import extract_words_from_text
+from utils.parallel_tokenize import tokenize_long_text, split_blocks
+from utils.words_from_text import tokenize
 from methods.words_from_examples_batch import words_from_examples_batch
+from methods.resolve_words import load_words_existing
+from methods.example_reservoir import pick_examples
+from methods.analysis_cache import resolve_text
+from methods.render_words import CompactLexicon, render_words, render_words_compact
 
 def row_to_dict(obj) -> dict:
     # ORM 객체를 dict로 안전하게 변환
     return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
 
-def analyze_text(text: str, db: Session=None, user_id:str = None) -> Dict[str, Any]:
-    if db is None:
-        db = SessionLocal()
-
-    document, words_dict = extract_words_from_text(text)
-    
-    # 필요한 필드만 선택하여 embedding 제외
-    stmt = (
-        select(
-            Word.id,
-            Word.user_id,
-            Word.lemma_id,
-            Word.lemma,
-            Word.jp_pron,
-            Word.kr_pron,
-            Word.kr_mean,
-            Word.level,
-            User.display_name
-        )
-        .join(User, Word.user_id == User.id)
-        .where(Word.lemma_id.in_(list(words_dict.keys())))
-        .order_by(
-            case((Word.user_id == user_id, 0), else_=1)  # 내 것이 먼저 오게
-        )
-    )
-    word_rows = db.execute(stmt).all()
-    
-    # UserWordSkill은 별도 쿼리로 가져오기
-    user_word_skills_stmt = (
-        select(UserWordSkill)
-        .where(UserWordSkill.word_id.in_([row.id for row in word_rows]))
-    )
-    user_word_skills = db.execute(user_word_skills_stmt).scalars().all()
-    
-    # word_id별로 user_word_skills 그룹화
-    skills_by_word_id = defaultdict(list)
-    word_ids_not_mastered = []
-    for skill in user_word_skills:
-        skills_by_word_id[skill.word_id].append(row_to_dict(skill))
-        if skill.reading < 80:
-            word_ids_not_mastered.append(skill.word_id)
+class SampledExampleRow(NamedTuple):
+    word_id: int
+    id: int
+    jp_text: str
+    kr_mean: str
+    tags: Optional[str]
+    audio_object_key: Optional[str]
+    image_object_key: Optional[str]
 
-    # 숙련도 낮은 WordExample 쿼리 (Word 별 최대 3개 까지만)
-    if word_ids_not_mastered:
-        # 각 word_id별로 최대 3개씩만 가져오기 위한 서브쿼리 (무작위로)
-        subquery = (
-            select(
-                WordExample.word_id,
-                WordExample.example_id,
-                func.row_number().over(
-                    partition_by=WordExample.word_id,
-                    order_by=func.random()
-                ).label('row_num')
-            )
-            .where(WordExample.word_id.in_(word_ids_not_mastered))
-        ).subquery()
-        
-        # WordExample에서 word별 3개 무작위 제한을 적용한 서브쿼리와 Example을 조인하여 한 번에 조회
-        examples_stmt = (
+def sample_example_rows(word_ids_not_mastered: List[int], db: Session) -> List[SampledExampleRow]:
+    # 숙련도 낮은 단어마다 예문 1개 (단어별 저수지에서 무작위로 고른 뒤 한 번에 조회)
+    if not word_ids_not_mastered:
+        return []
+    picks = pick_examples(word_ids_not_mastered, db, k=1)
+    example_ids = {example_id for example_ids in picks.values() for example_id in example_ids}
+    if not example_ids:
+        return []
+    examples_by_id = {
+        row.id: row
+        for row in db.execute(
             select(
                 Example.id,
                 Example.jp_text,
@@ -83,18 +52,21 @@ def analyze_text(text: str, db: Session=None, user_id:str = None) -> Dict[str, A
                 Example.audio_object_key,
                 Example.image_object_key,
             )
-            .select_from(Example)
-            .join(subquery, Example.id == subquery.c.example_id)
-            .where(subquery.c.row_num <= 1)
-        )
-        examples = db.execute(examples_stmt).all()
-    else:
-        examples = []
-
+            .where(Example.id.in_(example_ids))
+        ).all()
+    }
+    # 저수지에 남아 있지만 이미 삭제된 예문은 건너뛴다
+    return [
+        SampledExampleRow(word_id, *examples_by_id[example_id])
+        for word_id, example_ids in picks.items()
+        for example_id in example_ids
+        if example_id in examples_by_id
+    ]
 
+def build_examples_result(example_rows: List[Any], db: Session, user_id: str = None, lexicon: Optional[CompactLexicon] = None) -> Dict[int, Dict[str, Any]]:
     examples_data = []
     seen_example_ids = set()
-    for row in examples:
+    for row in example_rows:
         if row.id in seen_example_ids:
             continue
         seen_example_ids.add(row.id)
@@ -108,61 +80,102 @@ def analyze_text(text: str, db: Session=None, user_id:str = None) -> Dict[str, A
                 tags=row.tags,
             )
         )
-    examples_result = words_from_examples_batch(examples_data, db, user_id)
+    return words_from_examples_batch(examples_data, db, user_id, lexicon=lexicon)
+
+def sample_examples_for_words(word_ids_not_mastered: List[int], db: Session, user_id: str = None, lexicon: Optional[CompactLexicon] = None) -> Dict[int, Dict[str, Any]]:
+    return build_examples_result(sample_example_rows(word_ids_not_mastered, db), db, user_id, lexicon=lexicon)
+
+def build_analysis_result(document, words_dict, words_existing, word_ids_not_mastered, db: Session, user_id: str = None, compact: bool = False) -> Dict[str, Any]:
+    """
+    분석 결과 응답 생성.
+    compact=True면 단어 정보를 "lexicon" 테이블에 한 번씩만 담고,
+    본문/예문의 토큰은 [surface, lexicon 인덱스] 로만 표현한다.
+    """
+    if compact:
+        lexicon = CompactLexicon()
+        lines = render_words_compact(document, words_dict, words_existing, lexicon)
+        examples_result = sample_examples_for_words(word_ids_not_mastered, db, user_id, lexicon=lexicon)
+        return {"lexicon": lexicon.entries, "lines": lines, "examples": examples_result}
+    examples_result = sample_examples_for_words(word_ids_not_mastered, db, user_id)
+    words_result = render_words(document, words_dict, words_existing)
+    return {"words": words_result, "examples": examples_result}
+
+def analyze_text(text: str, db: Session=None, user_id:str = None, compact: bool = False) -> Dict[str, Any]:
+    if db is None:
+        db = SessionLocal()
+
+    # 같은 텍스트를 다시 열면 분석/단어 매칭/숙련도 조회를 캐시에서 가져온다 (예문 샘플링은 매번 새로)
+    document, words_dict, words_existing, word_ids_not_mastered = resolve_text(text, db, user_id, lambda: tokenize_long_text(text))
+    return build_analysis_result(document, words_dict, words_existing, word_ids_not_mastered, db, user_id, compact=compact)
+
+def analyze_texts_batch(texts: List[str], db: Session=None, user_id: str = None, compact: bool = False) -> List[Dict[str, Any]]:
+    """
+    여러 텍스트를 한 번에 분석한다.
+    전체 lemma_id 합집합에 대해 Word/UserWordSkill 조회와 예문 샘플링을 한 번씩만 수행하고,
+    결과는 입력 순서대로 텍스트별 {"words", "examples"} 로 나누어 돌려준다.
+    """
+    if db is None:
+        db = SessionLocal()
+
+    tokenized_list = [tokenize_long_text(text) for text in texts]
+    lemma_ids = set()
+    for tokenized in tokenized_list:
+        lemma_ids.update(tokenized.words.keys())
+    words_existing, word_ids_not_mastered = load_words_existing(list(lemma_ids), db, user_id)
+
+    example_rows = sample_example_rows(word_ids_not_mastered, db)
+    lexicon = CompactLexicon() if compact else None
+    examples_all = build_examples_result(example_rows, db, user_id, lexicon=lexicon)
+    not_mastered_set = set(word_ids_not_mastered)
+
+    results = []
+    for tokenized in tokenized_list:
+        word_ids = {
+            words_existing[lemma_id]["id"]
+            for lemma_id in tokenized.words
+            if lemma_id in words_existing
+        } & not_mastered_set
+        example_ids = {row.id for row in example_rows if row.word_id in word_ids}
+        result = {"examples": {example_id: examples_all[example_id] for example_id in example_ids if example_id in examples_all}}
+        if compact:
+            result["lines"] = render_words_compact(tokenized.document, tokenized.words, words_existing, lexicon)
+        else:
+            result["words"] = render_words(tokenized.document, tokenized.words, words_existing)
+        results.append(result)
+    if compact:
+        # 입력 전체가 하나의 lexicon을 공유
+        return {"lexicon": lexicon.entries, "results": results}
+    return results
 
-    # words_existing 딕셔너리 구성
-    words_existing = {}
-    for row in word_rows:
-        if row.lemma_id and row.lemma_id not in words_existing:
-            words_existing[row.lemma_id] = {
-                "id": row.id,
-                "user_id": row.user_id,
-                "lemma_id": row.lemma_id,
-                "lemma": row.lemma,
-                "jp_pron": row.jp_pron,
-                "kr_pron": row.kr_pron,
-                "kr_mean": row.kr_mean,
-                "level": row.level,
-                "user_word_skills": skills_by_word_id.get(row.id, []),
-                "user": {"display_name": row.display_name}
-            }
+def analyze_text_stream(text: str, user_id: str = None) -> Iterator[str]:
+    """
+    analyze_text의 NDJSON 스트리밍 버전.
+    ANALYSIS_STREAM_BLOCK_LINES 줄씩 분석/Word 매칭이 끝나는 대로
+    {"type": "lines", "start": 첫 줄 번호, "words": {줄 번호: [...]}} 를 내보내고,
+    마지막에 {"type": "examples", "examples": {...}} 를 내보낸다.
+    블록 크기가 고정이므로 첫 줄까지의 시간은 전체 텍스트 길이와 무관하다.
+    """
+    # 응답을 스트리밍하는 동안 쓸 세션은 요청 의존성과 별개로 직접 관리
+    db = SessionLocal()
+    try:
+        words_existing = {}
+        resolved_lemma_ids = set()
+        word_ids_not_mastered = []
+        line_offset = 0
+        for block_text in split_blocks(text.split("\n"), settings.ANALYSIS_STREAM_BLOCK_LINES):
+            document, words_dict = tokenize(block_text)
+            new_lemma_ids = [lemma_id for lemma_id in words_dict if lemma_id not in resolved_lemma_ids]
+            if new_lemma_ids:
+                block_existing, block_not_mastered = load_words_existing(new_lemma_ids, db, user_id)
+                words_existing.update(block_existing)
+                word_ids_not_mastered.extend(block_not_mastered)
+                resolved_lemma_ids.update(new_lemma_ids)
+            words_result = render_words(document, words_dict, words_existing, line_offset)
+            yield json.dumps(jsonable_encoder({"type": "lines", "start": line_offset, "words": words_result}), ensure_ascii=False) + "\n"
+            line_offset += len(document)
 
-    words_result = defaultdict(list)
-    for i_line, line in enumerate(document):
-        for i_word, word in enumerate(line):
-            surface = word["surface"]
-            lemma_id = word["lemma_id"]
-            if lemma_id in words_existing:
-                w = words_existing[lemma_id]
-                words_result[i_line].append({
-                    "word_id": w["id"],
-                    "lemma_id": w["lemma_id"],
-                    "lemma": w["lemma"],
-                    "user_id": w["user_id"],
-                    "user_display_name": w["user"]["display_name"],
-                    "surface": surface if w["lemma"] != "" else " "+surface,
-                    "jp_pron": w["jp_pron"],
-                    "kr_pron": w["kr_pron"],
-                    "kr_mean": w["kr_mean"],
-                    "level": w["level"],
-                    "user_word_skills": w["user_word_skills"],
-                    "num_user_word_skills": len(w["user_word_skills"]),
-                })
-            elif lemma_id in words_dict:
-                if words_dict[lemma_id]["lemma"] != "":
-                    w = words_dict[lemma_id]
-                    words_result[i_line].append({
-                        "word_id": None,
-                        "lemma_id": w["lemma_id"],
-                        "lemma": w["lemma"],
-                        "user_id": None,
-                        "user_display_name": None,
-                        "surface": surface if w["lemma"] != "" else " "+surface,
-                        "jp_pron": w["pronBase"],
-                        "kr_pron": w["pos1"],
-                        "kr_mean": w["type"],
-                        "level": None,
-                        "user_word_skills": [],
-                        "num_user_word_skills": 0,
-                    })
-    return {"words": words_result, "examples": examples_result}
\ No newline at end of file
+        examples_result = sample_examples_for_words(word_ids_not_mastered, db, user_id)
+        db.commit()  # 예문 토큰 스트림 backfill 저장
+        yield json.dumps(jsonable_encoder({"type": "examples", "examples": examples_result}), ensure_ascii=False) + "\n"
+    finally:
+        db.close()
@@ -1,15 +1,59 @@
 from sqlalchemy.orm import Session
 from typing import List
 
-from db import Example
-from methods.recommend_examples_worst_reading import recommend_examples_worst_reading
-from methods.recommend_examples_simple import recommend_examples_simple
+from db import Example, SessionLocal
+from settings import settings
+from methods.recommender_registry import recommend
+from methods.interest_vector import record_engaged_examples
 from methods.words_from_examples_batch import words_from_examples_batch
+from methods.render_words import CompactLexicon
+from methods.skill_versions import skill_versions
+from utils.prefetch_buffer import PrefetchBuffer
+from utils.words_from_text import warm_up_taggers
 
-def get_examples_for_user(db: Session = None, tags: List[str] = None, user_id: str = None) -> List[Example]:
-    if user_id is not None:
-        examples = recommend_examples_worst_reading(limit_examples=12, tags=tags, db=db, user_id=user_id)
-    else:
-        examples = recommend_examples_simple(limit_examples=6, tags=tags, db=db)
+# 사용자별 "다음 피드 배치" 버퍼. 숙련도 버전이 바뀌면 버린다
+# 배치를 만들며 예문 토큰을 backfill하므로 워커 스레드마다 Tagger를 먼저 준비한다
+feed_prefetch = PrefetchBuffer(
+    ttl_sec=settings.FEED_PREFETCH_TTL_SEC,
+    max_entries=settings.FEED_PREFETCH_USERS,
+    workers=settings.FEED_PREFETCH_WORKERS,
+    wait_sec=settings.FEED_PREFETCH_WAIT_MS / 1000,
+    initializer=warm_up_taggers,
+)
+
+def build_examples_for_user(db: Session = None, tags: List[str] = None, user_id: str = None, compact: bool = False, recommender: str = None) -> List[Example]:
+    limit_examples = 12 if user_id is not None else 6
+    examples = recommend(recommender, limit_examples, tags=tags, db=db, user_id=user_id)
+    if compact:
+        lexicon = CompactLexicon()
+        examples_result = list(words_from_examples_batch(examples, db=db, user_id=user_id, lexicon=lexicon).values())
+        return {"lexicon": lexicon.entries, "examples": examples_result}
     examples_result = list(words_from_examples_batch(examples, db=db, user_id=user_id).values())
-    return examples_result
\ No newline at end of file
+    return examples_result
+
+def _build_in_background(tags: List[str], user_id: str, compact: bool, recommender: str):
+    # 요청 세션은 응답 후 닫히므로 백그라운드 계산은 자체 세션을 쓴다
+    db = SessionLocal()
+    try:
+        examples_result = build_examples_for_user(db=db, tags=tags, user_id=user_id, compact=compact, recommender=recommender)
+        db.commit()  # 토큰 스트림 backfill 저장
+        return examples_result
+    finally:
+        db.close()
+
+def get_examples_for_user(db: Session = None, tags: List[str] = None, user_id: str = None, compact: bool = False, recommender: str = None, engaged_example_ids: List[int] = None) -> List[Example]:
+    """
+    미리 계산해 둔 배치가 있으면 바로 돌려주고, 없으면 지금 계산한다.
+    어느 쪽이든 응답 후 같은 조건의 다음 배치를 백그라운드에서 미리 계산해 둔다.
+    engaged_example_ids: 직전 배치에서 사용자가 본 예문. 관심 벡터에 반영한다 (다음 배치부터 적용)
+    commit은 호출하는 쪽에서 (관심 벡터 갱신, 토큰 스트림 backfill)
+    """
+    if user_id is not None and engaged_example_ids:
+        record_engaged_examples(user_id, engaged_example_ids, db)
+    key = (user_id, tuple(sorted(tags or [])), compact, recommender)
+    version = skill_versions.get(user_id)
+    examples_result = feed_prefetch.take(key, version)
+    if examples_result is None:
+        examples_result = build_examples_for_user(db=db, tags=tags, user_id=user_id, compact=compact, recommender=recommender)
+    feed_prefetch.schedule(key, version, lambda: _build_in_background(tags, user_id, compact, recommender))
+    return examples_result
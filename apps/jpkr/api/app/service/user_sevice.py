@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session, load_only
 from sqlalchemy import select, func
 from user_auth.db import User
 from db import Word, Example, UserText, UserWordSkill
+from methods.word_skill_stats import refresh_word_skill_stats
+from methods.skill_versions import skill_versions
 
 class UserService:
     """사용자와 연관된 모든 데이터를 가져오는 서비스"""
@@ -45,9 +47,15 @@ class UserService:
                 print(f"User not found: {id}")
                 return False
             
+            skill_word_ids = db.execute(
+                select(UserWordSkill.word_id).where(UserWordSkill.user_id == id)
+            ).scalars().all()
+
             # 사용자 삭제 (CASCADE 설정으로 인해 연관된 모든 데이터가 자동 삭제됨)
             db.delete(user)
+            refresh_word_skill_stats(skill_word_ids, db)
             db.commit()
+            skill_versions.bump(id)
             
             print(f"User and all related data deleted successfully: {id}")
             return True
@@ -0,0 +1,87 @@
+from typing import Dict, Any, Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+
+from db import UserText, UserTextLine
+from utils.parallel_tokenize import tokenize_long_text, merge_tokenized
+from utils.token_stream import text_hash, encode_token_stream, decode_token_stream
+from utils.words_from_text import TokenizedText
+from methods.analysis_cache import resolve_text
+from service.analysis_text import build_analysis_result
+
+
+def save_user_text_lines(user_text: UserText, db: Session) -> int:
+    """
+    UserText의 줄 단위 분석 결과를 갱신한다. (commit은 호출하는 쪽에서)
+    이미 저장된 줄과 내용(hash)이 같은 줄은 위치가 바뀌었더라도 재사용하고,
+    새로 생기거나 바뀐 줄만 모아서 한 번에 분석한다.
+    Returns: 새로 분석한 줄 수
+    """
+    lines = user_text.text.split("\n")
+    line_hashes = [text_hash(line) for line in lines]
+
+    old_rows = db.execute(
+        select(UserTextLine).where(UserTextLine.user_text_id == user_text.id)
+    ).scalars().all()
+    old_by_no = {row.line_no: row for row in old_rows}
+    stream_by_hash = {row.line_hash: row.stream for row in old_rows}
+
+    changed_line_nos = [
+        i for i, h in enumerate(line_hashes)
+        if h not in stream_by_hash
+    ]
+    if changed_line_nos:
+        tokenized = tokenize_long_text("\n".join(lines[i] for i in changed_line_nos))
+        for i, line_doc in zip(changed_line_nos, tokenized.document):
+            line_words = {word["lemma_id"]: tokenized.words[word["lemma_id"]] for word in line_doc}
+            stream_by_hash[line_hashes[i]] = encode_token_stream(lines[i], TokenizedText([line_doc], line_words))
+
+    for i, h in enumerate(line_hashes):
+        row = old_by_no.get(i)
+        if row is not None and row.line_hash == h:
+            continue
+        db.merge(UserTextLine(user_text_id=user_text.id, line_no=i, line_hash=h, stream=stream_by_hash[h]))
+    if len(old_rows) > len(lines):
+        db.execute(
+            delete(UserTextLine)
+            .where(UserTextLine.user_text_id == user_text.id, UserTextLine.line_no >= len(lines))
+        )
+    return len(changed_line_nos)
+
+
+def _load_line_rows(user_text_id: int, db: Session):
+    return db.execute(
+        select(UserTextLine)
+        .where(UserTextLine.user_text_id == user_text_id)
+        .order_by(UserTextLine.line_no)
+    ).scalars().all()
+
+
+def load_user_text_tokens(user_text: UserText, db: Session) -> TokenizedText:
+    """저장된 줄 단위 분석 결과를 읽는다. 없거나 오래된 줄은 다시 분석해 flush만 한다. (commit은 호출하는 쪽에서)"""
+    rows = _load_line_rows(user_text.id, db)
+    lines = user_text.text.split("\n")
+    if len(rows) != len(lines) or any(row.line_hash != text_hash(line) for row, line in zip(rows, lines)):
+        # 저장 결과가 없거나 오래된 경우 (예: 기능 추가 전에 저장된 텍스트)
+        save_user_text_lines(user_text, db)
+        db.flush()
+        rows = _load_line_rows(user_text.id, db)
+    return merge_tokenized([decode_token_stream(line, row.stream) for row, line in zip(rows, lines)])
+
+
+def analyze_user_text(user_text_id: int, db: Session, user_id: Optional[str] = None, compact: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    저장된 줄 단위 분석 결과로 /text/analyze와 같은 형태의 결과를 만든다.
+    MeCab은 거치지 않고, 단어 매칭(lexicon 스냅샷)과 사용자 숙련도만 새로 계산한다.
+    user_id의 텍스트가 아니면 None. (줄 분석을 새로 저장했을 수 있으므로 commit은 호출하는 쪽에서)
+    """
+    user_text = db.execute(
+        select(UserText).where(UserText.id == user_text_id, UserText.user_id == user_id)
+    ).scalar_one_or_none()
+    if user_text is None:
+        return None
+    document, words_dict, words_existing, word_ids_not_mastered = resolve_text(
+        user_text.text, db, user_id, lambda: load_user_text_tokens(user_text, db)
+    )
+    return build_analysis_result(document, words_dict, words_existing, word_ids_not_mastered, db, user_id, compact=compact)
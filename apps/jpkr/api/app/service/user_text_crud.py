@@ -6,6 +6,7 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from models import TextData
 from db import SessionLocal, UserText
+from service.user_text_analysis import save_user_text_lines
 from datetime import datetime
 
 
@@ -24,6 +25,8 @@ async def create_user_text(user_text_data: TextData, db: Session, user_id: Optio
         user_id=user_id,
     )
     db.add(user_text)
+    db.flush()  # ID 생성을 위해 flush
+    save_user_text_lines(user_text, db)
     db.commit()
     return row_to_dict(user_text)
 
@@ -70,6 +73,7 @@ async def update_user_text(user_text_data: TextData, db: Session=None, user_id:s
             if value and key != "id":
                 setattr(user_text, key, value)
         user_text.user_id = user_id
+        save_user_text_lines(user_text, db)  # 바뀐 줄만 다시 분석
         result[user_text_data.id] = row_to_dict(user_text)            
         db.commit()
     else:        
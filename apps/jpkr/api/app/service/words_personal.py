@@ -1,11 +1,19 @@
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import select, func, case
-from db import Word, UserWordSkill
+from db import Word, UserWordSkill, Example
 
 import json
 from fastapi import UploadFile, File, Form, HTTPException
 from utils.aws_s3 import presign_get_url
+from methods.lexicon_snapshot import lexicon_snapshot
+from methods.word_skill_stats import refresh_word_skill_stats
+from methods.skill_versions import skill_versions
+from methods.word_schedule import schedule_review
+from methods.interest_vector import record_low_skill_words
+from methods.learning_queue import next_words_to_learn
+from methods.example_reservoir import pick_examples
+from settings import settings
 
 async def create_words_personal(
     data_json: str = Form(...),                     # 단어 배열(JSON string)
@@ -94,6 +102,7 @@ async def create_words_personal(
             existing_skill.reading = payload.get('reading', 0)
             existing_skill.listening = payload.get('listening', 0)
             existing_skill.speaking = payload.get('speaking', 0)
+            schedule_review(existing_skill, db)
             updated_skills.append(word)
         else:
             new_skill = UserWordSkill(
@@ -105,10 +114,19 @@ async def create_words_personal(
             )
             db.add(new_skill)
             db.flush()
+            schedule_review(new_skill, db)
             created_skills.append(word)
 
-
+    refresh_word_skill_stats(word_id_map.values(), db)
+    # reading을 보내지 않은 단어는 관심 신호로 쓰지 않는다 (0으로 보면 가중치가 최대가 됨)
+    record_low_skill_words(
+        user_id,
+        {word_id_map[word]: payload['reading'] for word, payload in words_map.items() if payload.get('reading') is not None},
+        db,
+    )
     db.commit()
+    lexicon_snapshot.refresh(db)
+    skill_versions.bump(user_id)
 
     return {
         "success": True,
@@ -126,6 +144,7 @@ def get_random_words_to_learn(limit: int, db: Session, user_id: str):
     1. level: N5 > N4 > N3 > N2 > N1 > 레벨 null 순
     2. 같은 level인 경우 사용자의 user word skill 총합이 작은 순
     3. 2가 같은 경우, 무작위 선택
+    단어별 예문은 최대 LEARN_EXAMPLES_PER_WORD개까지 (무작위).
     
     Args:
         limit: 가져올 단어 수
@@ -135,64 +154,49 @@ def get_random_words_to_learn(limit: int, db: Session, user_id: str):
     Returns:
         우선순위에 따라 정렬된 단어 리스트
     """
-    # level 우선순위를 위한 case 문
-    level_priority = case(
-        (Word.level == 'N5', 1),
-        (Word.level == 'N4', 2),
-        (Word.level == 'N3', 3),
-        (Word.level == 'N2', 4),
-        (Word.level == 'N1', 5),
-        else_=6
-    )
-    
-    # UserWordSkill의 총합을 계산 (없는 경우 0으로 처리)
-    skill_sum = func.coalesce(
-        func.coalesce(UserWordSkill.reading, 0) +
-        func.coalesce(UserWordSkill.listening, 0) +
-        func.coalesce(UserWordSkill.speaking, 0), 0
-    )
-    
-    # 쿼리 실행
-    stmt = (
-        select(Word, level_priority.label('level_priority'), skill_sum.label('total_skill'))
-        .options(
-            selectinload(Word.word_examples),
-        )
-        .outerjoin(UserWordSkill, (UserWordSkill.word_id == Word.id) & (UserWordSkill.user_id == user_id))
-        .order_by(
-            level_priority.asc(),  # level 우선순위 (낮은 숫자가 높은 우선순위)
-            skill_sum.asc(),       # skill 총합이 작은 순
-            func.random()          # 무작위 선택
-        )
-        .limit(limit)
-    )
-    
-    result = db.execute(stmt).all()
-    
-    # Word 객체를 딕셔너리로 변환하여 반환 (순환 참조 방지)
+    # 전체 단어 정렬 대신 레벨/숙련도 밴드로 나눈 학습 큐에서 limit개만 꺼낸다
+    records = next_words_to_learn(limit, db, user_id)
+
+    # 단어당 예문은 저수지에서 최대 LEARN_EXAMPLES_PER_WORD개만, 한 번에 조회
+    example_ids_by_word = pick_examples([record.id for record in records], db, k=settings.LEARN_EXAMPLES_PER_WORD)
+    example_ids = {example_id for ids in example_ids_by_word.values() for example_id in ids}
+    examples_by_id = {}
+    if example_ids:
+        examples_by_id = {
+            row.id: row
+            for row in db.execute(
+                select(Example.id, Example.tags, Example.jp_text, Example.kr_mean, Example.audio_object_key)
+                .where(Example.id.in_(example_ids))
+            ).all()
+        }
+
+    # 딕셔너리로 변환하여 반환
     words_data = []
-    for row in result:
-        word = row[0]
+    for record in records:
+        word_examples = [
+            examples_by_id[example_id]
+            for example_id in example_ids_by_word.get(record.id, [])
+            if example_id in examples_by_id
+        ]
         word_dict = {
-            "id": word.id,
-            "lemma_id": word.lemma_id,
-            "lemma": word.lemma,
-            "jp_pron": word.jp_pron,
-            "kr_pron": word.kr_pron,
-            "kr_mean": word.kr_mean,
-            "level": word.level,
-            "user_id": word.user_id,
+            "id": record.id,
+            "lemma_id": record.lemma_id,
+            "lemma": record.lemma,
+            "jp_pron": record.jp_pron,
+            "kr_pron": record.kr_pron,
+            "kr_mean": record.kr_mean,
+            "level": record.level,
+            "user_id": record.user_id,
             "examples": [
                 {
-                    "id": wex.example.id,
-                    "word_info": word.lemma,
-                    "tags": wex.example.tags,
-                    "jp_text": wex.example.jp_text,
-                    "kr_mean": wex.example.kr_mean,
-                    "audio_url": presign_get_url(wex.example.audio_object_key, expires=600) if wex.example.audio_object_key else None,
-                } for wex in word.word_examples
-            ] if word.word_examples else []
+                    "id": example.id,
+                    "word_info": record.lemma,
+                    "tags": example.tags,
+                    "jp_text": example.jp_text,
+                    "kr_mean": example.kr_mean,
+                    "audio_url": presign_get_url(example.audio_object_key, expires=600) if example.audio_object_key else None,
+                } for example in word_examples
+            ]
         }
         words_data.append(word_dict)    
     return words_data 
-    
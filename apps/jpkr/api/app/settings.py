@@ -25,6 +25,38 @@ class Settings(BaseModel):
     AWS_REGION: str = os.getenv("AWS_REGION", "ap-northeast-2")
     S3_BUCKET: str = os.getenv("S3_BUCKET", "")
     S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "")
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))  # 공유 S3 클라이언트의 HTTP 연결 풀 크기
     MAX_IMAGE_SIZE_MB: int = 1
 
+    # Text analysis (긴 텍스트는 줄 블록 단위로 프로세스 풀에서 병렬 분석)
+    ANALYSIS_PARALLEL_MIN_LINES: int = int(os.getenv("ANALYSIS_PARALLEL_MIN_LINES", "400"))
+    ANALYSIS_BLOCK_LINES: int = int(os.getenv("ANALYSIS_BLOCK_LINES", "200"))
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "0"))  # 0이면 CPU 수
+    ANALYSIS_STREAM_BLOCK_LINES: int = int(os.getenv("ANALYSIS_STREAM_BLOCK_LINES", "20"))
+    LEXICON_REFRESH_SEC: int = int(os.getenv("LEXICON_REFRESH_SEC", "30"))  # 단어 스냅샷 증분 갱신 주기
+    LEXICON_REFRESH_OVERLAP_SEC: int = 60
+    EXAMPLE_RESERVOIR_SIZE: int = int(os.getenv("EXAMPLE_RESERVOIR_SIZE", "16"))  # 단어별로 보관하는 예문 후보 수
+    EXAMPLE_RESERVOIR_ROTATE_SEC: int = int(os.getenv("EXAMPLE_RESERVOIR_ROTATE_SEC", "600"))  # 예문이 저수지보다 많은 단어의 후보를 다시 뽑는 주기
+    ANALYSIS_CACHE_TEXTS: int = int(os.getenv("ANALYSIS_CACHE_TEXTS", "256"))  # 텍스트 단위 분석 캐시 크기 (0이면 사용 안 함)
+    ANALYSIS_CACHE_OVERLAYS: int = int(os.getenv("ANALYSIS_CACHE_OVERLAYS", "1024"))  # 사용자별 숙련도 overlay 캐시 크기
+    EXAMPLE_GRAPH_REFRESH_SEC: int = int(os.getenv("EXAMPLE_GRAPH_REFRESH_SEC", "30"))  # 단어-예문 그래프 증분 갱신 주기
+    RECOMMEND_OVERLAY_USERS: int = int(os.getenv("RECOMMEND_OVERLAY_USERS", "1024"))  # 사용자별 추천 가중치(alias 테이블) 캐시 크기
+    TAG_INDEX_REFRESH_SEC: int = int(os.getenv("TAG_INDEX_REFRESH_SEC", "30"))  # 태그 인덱스 변경 확인 주기
+    FEED_PREFETCH_TTL_SEC: int = int(os.getenv("FEED_PREFETCH_TTL_SEC", "60"))  # 미리 계산한 다음 피드 배치 유효 시간
+    FEED_PREFETCH_USERS: int = int(os.getenv("FEED_PREFETCH_USERS", "512"))  # 버퍼에 둘 최대 사용자(조건) 수 (0이면 사용 안 함)
+    FEED_PREFETCH_WORKERS: int = int(os.getenv("FEED_PREFETCH_WORKERS", "2"))
+    FEED_PREFETCH_WAIT_MS: int = int(os.getenv("FEED_PREFETCH_WAIT_MS", "200"))  # 아직 계산 중인 배치를 기다리는 최대 시간 (넘으면 요청에서 새로 계산)
+    LEARN_EXAMPLES_PER_WORD: int = int(os.getenv("LEARN_EXAMPLES_PER_WORD", "3"))  # 학습 단어마다 함께 보내는 최대 예문 수
+    INTEREST_DECAY: float = float(os.getenv("INTEREST_DECAY", "0.9"))  # 관심 벡터 갱신 시 기존 누적치에 곱하는 감쇠
+    INTEREST_LOW_READING: int = int(os.getenv("INTEREST_LOW_READING", "60"))  # 이 reading 미만인 단어를 관심 신호로 반영
+    INTEREST_CANDIDATES: int = int(os.getenv("INTEREST_CANDIDATES", "4"))  # ANN 후보 수 = limit * 이 값 (이 중에서 무작위 선택)
+    RECOMMEND_DEFAULT: str = os.getenv("RECOMMEND_DEFAULT", "worst_reading")  # 요청에 recommender가 없을 때 (로그인 사용자)
+    RECOMMEND_ANONYMOUS: str = os.getenv("RECOMMEND_ANONYMOUS", "simple")  # 비로그인 사용자
+    RECOMMEND_BUDGET_MS: int = int(os.getenv("RECOMMEND_BUDGET_MS", "300"))  # 추천 알고리즘 지연 예산 (0이면 예산 없음)
+    RECOMMEND_BUDGETS_MS: str = os.getenv("RECOMMEND_BUDGETS_MS", "")  # 알고리즘별 예산, 예: "due=200,interest=400"
+    RECOMMEND_WORKERS: int = int(os.getenv("RECOMMEND_WORKERS", "8"))
+    FALLBACK_POOL_SIZE: int = int(os.getenv("FALLBACK_POOL_SIZE", "256"))  # 예산 초과 시 답할 무작위 예문 풀 크기
+    FALLBACK_POOL_TTL_SEC: int = int(os.getenv("FALLBACK_POOL_TTL_SEC", "300"))  # presign URL 만료(600초) 전에 교체
+    TOKEN_CACHE_LINES: int = int(os.getenv("TOKEN_CACHE_LINES", "50000"))  # 줄 단위 분석 결과 LRU 크기 (0이면 사용 안 함)
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,42 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def build_alias_table(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vose alias 테이블 생성 (O(n)).
+    Returns: (prob, alias) - i번 칸을 고른 뒤 prob[i] 확률로 i, 아니면 alias[i]
+    """
+    n = len(weights)
+    prob = np.zeros(n, dtype=np.float64)
+    alias = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return prob, alias
+    scaled = np.asarray(weights, dtype=np.float64) * (n / float(np.sum(weights)))
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    # 부동소수 오차로 남은 칸은 자기 자신을 확률 1로
+    for i in large + small:
+        prob[i] = 1.0
+        alias[i] = i
+    return prob, alias
+
+
+def alias_sample(prob: np.ndarray, alias: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """alias 테이블에서 k개를 복원 추출 (벡터화, O(k))"""
+    if k <= 0 or len(prob) == 0:
+        return np.empty(0, dtype=np.int64)
+    slots = rng.integers(len(prob), size=k)
+    keep = rng.random(k) < prob[slots]
+    return np.where(keep, slots, alias[slots])
@@ -2,6 +2,7 @@
 import uuid
 import mimetypes
 import io
+import threading
 import boto3
 from botocore.client import Config
 from typing import BinaryIO
@@ -9,16 +10,31 @@ from settings import settings
 
 ALLOWED_CT = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 
-def get_s3():
+_s3 = None
+_s3_lock = threading.Lock()
+
+def build_s3():
     return boto3.client(
         "s3",
         region_name=settings.AWS_REGION,
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        endpoint_url=settings.S3_ENDPOINT_URL,
-        config=Config(s3={"addressing_style": "virtual"})
+        endpoint_url=settings.S3_ENDPOINT_URL or None,
+        config=Config(
+            s3={"addressing_style": "virtual"},
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        )
     )
 
+def get_s3():
+    # 프로세스당 클라이언트 하나를 재사용 (boto3 client는 스레드 안전, 생성은 기본 세션을 건드리므로 lock)
+    global _s3
+    if _s3 is None:
+        with _s3_lock:
+            if _s3 is None:
+                _s3 = build_s3()
+    return _s3
+
 def is_allowed_content_type(ct: str | None) -> bool:
     return (ct or "") in ALLOWED_CT
 
@@ -0,0 +1,64 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from settings import settings
+from utils.words_from_text import TokenizedText, tokenize, warm_up_taggers
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    # 워커 프로세스마다 자신의 Tagger를 하나씩 갖는다
+    warm_up_taggers()
+
+
+def _tokenize_block(block_text: str) -> TokenizedText:
+    return tokenize(block_text)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = settings.ANALYSIS_WORKERS or os.cpu_count() or 1
+            _executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        return _executor
+
+
+def split_blocks(lines: List[str], block_lines: int) -> List[str]:
+    block_lines = max(1, block_lines)
+    return ["\n".join(lines[i:i + block_lines]) for i in range(0, len(lines), block_lines)]
+
+
+def merge_tokenized(results: List[TokenizedText]) -> TokenizedText:
+    # 블록 순서대로 이어붙이므로 줄 번호는 원문과 같다
+    document = []
+    words_dict = {}
+    for result in results:
+        document.extend(result.document)
+        for lemma_id, info in result.words.items():
+            words_dict.setdefault(lemma_id, info)
+    return TokenizedText(document, words_dict)
+
+
+def tokenize_long_text(text: str) -> TokenizedText:
+    """
+    ANALYSIS_PARALLEL_MIN_LINES 이상인 텍스트는 ANALYSIS_BLOCK_LINES 줄씩 나누어
+    프로세스 풀에서 분석한 뒤 줄 순서대로 합친다. 짧은 텍스트는 현재 스레드에서 바로 분석.
+    """
+    lines = text.split("\n")
+    if len(lines) < settings.ANALYSIS_PARALLEL_MIN_LINES:
+        return tokenize(text)
+    blocks = split_blocks(lines, settings.ANALYSIS_BLOCK_LINES)
+    return merge_tokenized(list(_get_executor().map(_tokenize_block, blocks)))
+
+
+def shutdown_tokenize_workers():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
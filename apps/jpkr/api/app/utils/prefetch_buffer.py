@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class PrefetchBuffer:
+    """
+    키별로 "다음 결과" 하나를 백그라운드에서 미리 계산해 두는 버퍼.
+    각 항목은 계산을 예약한 시점의 version과 함께 저장되고, TTL이 지났거나
+    꺼낼 때의 version과 다르면 (예: 사용자 숙련도 변경) 버린다.
+    아직 계산 중인 항목은 wait_sec까지만 기다리고, 넘으면 None을 돌려 호출한 쪽이 직접 계산하게 한다.
+    initializer는 워커 스레드마다 첫 작업 전에 한 번 실행된다 (예: thread-local 자원 준비).
+    """
+
+    def __init__(self, ttl_sec: float, max_entries: int, workers: int, wait_sec: float = 0.2, initializer: Optional[Callable[[], None]] = None):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.workers = workers
+        self.wait_sec = wait_sec
+        self.initializer = initializer
+        self._lock = threading.Lock()
+        # key -> (version, 만료 시각, Future)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, Future]]" = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch", initializer=self.initializer)
+        return self._executor
+
+    def take(self, key: Hashable, version: Any) -> Optional[Any]:
+        """미리 계산된 결과를 꺼낸다 (한 번만 쓸 수 있음). 아직 계산 중이면 wait_sec까지만 기다린다."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+        entry_version, expires_at, future = entry
+        if entry_version != version or time.monotonic() > expires_at:
+            future.cancel()
+            with self._lock:
+                self.stale += 1
+            return None
+        try:
+            result = future.result(timeout=self.wait_sec)
+        except FutureTimeoutError:
+            # 실행 전이면 취소되고, 실행 중이면 끝까지 돈 뒤 버려진다
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            return None
+        except Exception as e:
+            print(f"prefetch failed: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def schedule(self, key: Hashable, version: Any, fn: Callable[[], Any]) -> None:
+        if self.max_entries <= 0 or self.workers <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            future = self._get_executor().submit(fn)
+            self._entries[key] = (version, time.monotonic() + self.ttl_sec, future)
+            while len(self._entries) > self.max_entries:
+                _, (_, _, old_future) = self._entries.popitem(last=False)
+                old_future.cancel()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses, "stale": self.stale, "timeouts": self.timeouts}
@@ -0,0 +1,48 @@
+import threading
+
+import fugashi
+import unidic
+
+
+def _build_tagger() -> fugashi.Tagger:
+    return fugashi.Tagger('-d "{}"'.format(unidic.DICDIR))
+
+
+class TaggerPool:
+    """
+    프로세스 단위 MeCab Tagger 풀.
+    사전 로딩 비용이 파싱보다 크므로 스레드마다 Tagger를 하나만 만들어 재사용한다.
+    (fugashi.Tagger는 스레드 간 공유가 안전하지 않으므로 thread-local로 보관)
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._built = 0
+        self._reused = 0
+
+    def get(self) -> fugashi.Tagger:
+        tagger = getattr(self._local, "tagger", None)
+        if tagger is None:
+            tagger = _build_tagger()
+            self._local.tagger = tagger
+            with self._lock:
+                self._built += 1
+        else:
+            with self._lock:
+                self._reused += 1
+        return tagger
+
+    def tokenize(self, line_text: str):
+        return self.get()(line_text)
+
+    def warm_up(self):
+        # 사전 로딩 + 첫 파싱 비용을 미리 지불. thread-local이므로 호출한 스레드의 Tagger만 만든다
+        self.tokenize("ウォームアップ")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"built": self._built, "reused": self._reused}
+
+
+tagger_pool = TaggerPool()
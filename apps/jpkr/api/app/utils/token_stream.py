@@ -0,0 +1,49 @@
+import hashlib
+from typing import Any, Dict
+
+from utils.words_from_text import LemmaInfo, TokenizedText
+
+# 토큰 스트림에 함께 저장하는 lemma 필드 (Word 테이블에 없는 lemma를 렌더링/등록할 때 사용)
+LEMMA_FIELDS = ("lemma", "pronBase", "pos1", "type")
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def encode_token_stream(text: str, tokenized: TokenizedText) -> Dict[str, Any]:
+    """
+    TokenizedText를 저장용 압축 포맷으로 변환한다.
+    - "t": [line_index, start, end, lemma_id] (surface는 원문 line[start:end])
+    - "l": [lemma_id, lemma, pronBase, pos1, type]
+    """
+    tokens = []
+    for i_line, (line_text, line) in enumerate(zip(text.split("\n"), tokenized.document)):
+        cursor = 0
+        for word in line:
+            surface = word["surface"]
+            start = line_text.find(surface, cursor)
+            if start < 0:
+                start = cursor
+            end = start + len(surface)
+            tokens.append([i_line, start, end, word["lemma_id"]])
+            cursor = end
+    lemmas = [
+        [lemma_id] + [getattr(w, field) for field in LEMMA_FIELDS]
+        for lemma_id, w in tokenized.words.items()
+    ]
+    return {"t": tokens, "l": lemmas}
+
+
+def decode_token_stream(text: str, stream: Dict[str, Any]) -> TokenizedText:
+    lines = text.split("\n")
+    document = [[] for _ in lines]
+    for i_line, start, end, lemma_id in stream["t"]:
+        document[i_line].append({
+            "surface": lines[i_line][start:end],
+            "lemma_id": lemma_id,
+        })
+    words_dict = {}
+    for lemma_id, *values in stream["l"]:
+        words_dict[lemma_id] = LemmaInfo(lemma_id, **dict(zip(LEMMA_FIELDS, values)))
+    return TokenizedText(document, words_dict)
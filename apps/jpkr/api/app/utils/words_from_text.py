@@ -1,57 +1,135 @@
-import fugashi
-import unidic
+import hashlib
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from settings import settings
+from utils.lru_cache import LRUCache
+from utils.tagger_pool import tagger_pool
+
+
+class LemmaInfo:
+    """
+    lemma 단위 UniDic feature 레코드.
+    자주 쓰는 필드(lemma, pos1, pronBase, type)만 슬롯으로 두고,
+    나머지 UniDic 필드(pos2, cForm, kana ...)는 원본 feature 튜플에서 접근 시점에 꺼낸다.
+    """
+    __slots__ = ("lemma_id", "lemma", "pos1", "pronBase", "type", "_raw", "_fields")
+
+    def __init__(self, lemma_id, lemma, pos1, pronBase, type, raw=(), fields=()):
+        self.lemma_id = lemma_id
+        self.lemma = lemma
+        self.pos1 = pos1
+        self.pronBase = pronBase
+        self.type = type
+        self._raw = raw
+        self._fields = fields
+
+    @classmethod
+    def from_feature(cls, lemma_id, feat) -> "LemmaInfo":
+        return cls(
+            lemma_id,
+            getattr(feat, "lemma", None),
+            getattr(feat, "pos1", None),
+            getattr(feat, "pronBase", None),
+            getattr(feat, "type", None),
+            raw=tuple(feat),
+            fields=getattr(feat, "_fields", ()),
+        )
+
+    def __getattr__(self, name):
+        # 슬롯에 없는 UniDic 필드만 여기로 온다 (pickle 등이 찾는 내부 속성은 제외)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._raw[self._fields.index(name)]
+        except ValueError:
+            return None
+
+    def __repr__(self):
+        return f"LemmaInfo(lemma_id={self.lemma_id!r}, lemma={self.lemma!r}, pos1={self.pos1!r})"
+
+
+# lemma_id -> LemmaInfo (프로세스 단위 공유). 항목 수는 UniDic 사전 크기로 제한된다.
+# 같은 lemma의 활용형마다 다른 필드(orth, cForm 등)는 처음 본 형태 기준으로 남는다.
+_lemma_cache: Dict[int, LemmaInfo] = {}
+
+
+def get_lemma_info(lemma_id: Optional[int], feat) -> LemmaInfo:
+    if lemma_id is None:
+        return LemmaInfo.from_feature(lemma_id, feat)
+    info = _lemma_cache.get(lemma_id)
+    if info is None:
+        info = _lemma_cache.setdefault(lemma_id, LemmaInfo.from_feature(lemma_id, feat))
+    return info
+
+
+class TokenizedText(NamedTuple):
+    """
+    tokenize() 결과. 한 번 분석한 결과를 단어 수집/렌더링/연결 단계에서 재사용한다.
+    (기존 코드와의 호환을 위해 document, words_dict 로 언패킹 가능)
+    """
+    document: List[List[Dict[str, Any]]]
+    words: Dict[Optional[int], LemmaInfo]
+
+
+# 줄 해시 -> (원문 줄, ((surface, lemma_id), ...), ((lemma_id, LemmaInfo), ...))
+# 같은 가사/자막 줄이 여러 문서, 여러 사용자에게서 반복되므로 요청 간에 공유한다.
+_line_cache = LRUCache(settings.TOKEN_CACHE_LINES)
+
+
+def _line_key(line_text: str) -> str:
+    # surface가 원문 그대로 저장되므로 정규화하지 않은 원문으로 키를 만든다
+    return hashlib.sha1(line_text.encode("utf-8")).hexdigest()
+
+
+def _tag_line(tagger, line_text: str):
+    tokens = []
+    lemmas = {}
+    for word in tagger(line_text):
+        feat = word.feature            
+        lemma_id = int(getattr(feat, "lemma_id", None)) if getattr(feat, "lemma_id", None) else None
+        tokens.append((word.surface, lemma_id))
+        #if lemma_id is None:
+        #    continue
+        if lemma_id not in lemmas:
+            lemmas[lemma_id] = get_lemma_info(lemma_id, feat)
+    return tuple(tokens), tuple(lemmas.items())
+
+
+def tokenize(text: str) -> TokenizedText:
+    tagger = None
 
-def extract_words_from_text(text: str):
-    tagger = fugashi.Tagger('-d "{}"'.format(unidic.DICDIR))
-  
     document = []
     words_dict = {}
     text_list = text.split("\n")
     for line_text in text_list:
-        line = []
-        line_words = tagger(line_text)
-        for word in line_words:
-            feat = word.feature            
-            lemma_id = int(getattr(feat, "lemma_id", None)) if getattr(feat, "lemma_id", None) else None
-            line.append({                
-                "surface": word.surface,
-                #"surface": word.surface if getattr(feat, "lemma", None) != None else " "+word.surface,
-                "lemma_id": lemma_id,
-            })
-            #if lemma_id is None:
-            #    continue
+        key = _line_key(line_text)
+        cached = _line_cache.get(key, validate=lambda entry: entry[0] == line_text)
+        if cached is None:
+            if tagger is None:
+                tagger = tagger_pool.get()
+            tokens, lemmas = _tag_line(tagger, line_text)
+            _line_cache.put(key, (line_text, tokens, lemmas))
+        else:
+            _, tokens, lemmas = cached
+        document.append([{"surface": surface, "lemma_id": lemma_id} for surface, lemma_id in tokens])
+        for lemma_id, info in lemmas:
             if lemma_id not in words_dict:                
-                words_dict[lemma_id] = {
-                    "lemma_id": lemma_id,
-                    "lemma": getattr(feat, "lemma", None),
-                    "pos1": getattr(feat, "pos1", None),
-                    "pos2": getattr(feat, "pos2", None),
-                    "pos3": getattr(feat, "pos3", None),
-                    "pos4": getattr(feat, "pos4", None),
-                    "cType": getattr(feat, "cType", None),
-                    "cForm": getattr(feat, "cForm", None),
-                    "lForm": getattr(feat, "lForm", None),
-                    "orth": getattr(feat, "orth", None),
-                    "pron": getattr(feat, "pron", None),
-                    "orthBase": getattr(feat, "orthBase", None),
-                    "pronBase": getattr(feat, "pronBase", None),
-                    "goshu": getattr(feat, "goshu", None),
-                    "iType": getattr(feat, "iType", None),
-                    "iForm": getattr(feat, "iForm", None),
-                    "fType": getattr(feat, "fType", None),
-                    "fForm": getattr(feat, "fForm", None),
-                    "iConType": getattr(feat, "iConType", None),
-                    "fConType": getattr(feat, "fConType", None),
-                    "type": getattr(feat, "type", None),
-                    "kana": getattr(feat, "kana", None),
-                    "kanaBase": getattr(feat, "kanaBase", None),
-                    "form": getattr(feat, "form", None),
-                    "formBase": getattr(feat, "formBase", None),
-                    "aType": getattr(feat, "aType", None),
-                    "aConType": getattr(feat, "aConType", None),
-                    "aModType": getattr(feat, "aModType", None),
-                    "lid": getattr(feat, "lid", None),
-                }
-        document.append(line)
+                words_dict[lemma_id] = info
         
-    return document, words_dict
\ No newline at end of file
+    return TokenizedText(document, words_dict)
+
+
+# 기존 이름 호환용
+extract_words_from_text = tokenize
+
+
+def warm_up_taggers():
+    tagger_pool.warm_up()
+
+
+def tagger_stats() -> dict:
+    return {**tagger_pool.stats(), "lemma_cache_size": len(_lemma_cache)}
+
+
+def line_cache_stats() -> dict:
+    return _line_cache.stats()
@@ -0,0 +1,47 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+# settings가 import 시점에 ONIGIRI_DB_URL을 읽으므로 앱 모듈보다 먼저 설정한다 (메모리 SQLite)
+os.environ["ONIGIRI_DB_URL"] = "sqlite://"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, INET
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(ARRAY, "sqlite")
+@compiles(JSONB, "sqlite")
+@compiles(INET, "sqlite")
+def _compile_pg_only_types(type_, compiler, **kw):
+    # user_auth 테이블의 PostgreSQL 전용 타입은 테스트에서 쓰지 않으므로 TEXT로 만든다
+    return "TEXT"
+
+
+import db as app_db
+from user_auth.db import User
+
+app_db.Base.metadata.create_all(bind=app_db.engine)
+
+
+@pytest.fixture
+def db():
+    session = app_db.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(app_db.Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def user_id(db):
+    user_id = str(uuid.uuid4())
+    db.add(User(id=user_id, display_name="tester"))
+    db.commit()
+    return user_id
@@ -0,0 +1,40 @@
+from db import Word, Example, WordExample
+from settings import settings
+from methods.example_reservoir import ensure_example_reservoirs, load_reservoirs, pick_examples
+
+
+def _word_with_examples(db, user_id, count):
+    word = Word(user_id=user_id, lemma_id=1, lemma="猫", jp_pron="ネコ", kr_pron="네코", kr_mean="고양이", level="N5")
+    db.add(word)
+    db.flush()
+    examples = [Example(user_id=user_id, tags="food", jp_text=f"猫{i}", kr_mean="뜻") for i in range(count)]
+    db.add_all(examples)
+    db.flush()
+    db.add_all([WordExample(word_id=word.id, example_id=example.id) for example in examples])
+    db.commit()
+    ensure_example_reservoirs(db)
+    return word, examples
+
+
+def test_pick_examples_stays_in_fresh_reservoir(db, user_id):
+    word, _ = _word_with_examples(db, user_id, settings.EXAMPLE_RESERVOIR_SIZE * 3)
+    reservoir = set(load_reservoirs([word.id], db)[word.id])
+    assert len(reservoir) == settings.EXAMPLE_RESERVOIR_SIZE
+
+    for _ in range(50):
+        picked = pick_examples([word.id], db, k=3)[word.id]
+        assert len(picked) == len(set(picked)) == 3
+        assert set(picked) <= reservoir
+
+
+def test_expired_reservoir_is_resampled(db, user_id, monkeypatch):
+    word, examples = _word_with_examples(db, user_id, settings.EXAMPLE_RESERVOIR_SIZE * 3)
+    monkeypatch.setattr(settings, "EXAMPLE_RESERVOIR_ROTATE_SEC", -1)  # 매번 만료
+
+    seen = set()
+    for _ in range(30):
+        seen.update(pick_examples([word.id], db, k=3)[word.id])
+        db.commit()
+    # 처음 뽑힌 저수지(16개)에 묶이지 않고 연결된 전체 예문에서 돈다
+    assert len(seen) > settings.EXAMPLE_RESERVOIR_SIZE
+    assert seen <= {example.id for example in examples}
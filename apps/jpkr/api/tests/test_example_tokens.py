@@ -0,0 +1,51 @@
+from sqlalchemy import insert
+
+from db import Example, ExampleToken, Word
+import methods.example_tokens as example_tokens
+from utils.words_from_text import TokenizedText
+
+
+def _fake_tokenize(text):
+    return TokenizedText([[]], {})
+
+
+def test_backfill_stays_in_callers_transaction(db, user_id, monkeypatch):
+    monkeypatch.setattr(example_tokens, "tokenize", _fake_tokenize)
+    example = Example(user_id=user_id, tags="food", jp_text="猫だ", kr_mean="뜻")
+    db.add(example)
+    db.commit()
+
+    word = Word(user_id=user_id, lemma_id=1, lemma="猫", jp_pron="ネコ", kr_pron="네코", kr_mean="고양이", level="N5")
+    db.add(word)  # 호출하는 쪽의 미완료 변경
+    example_tokens.tokenize_examples([example], db)
+    assert db.in_transaction()
+    db.rollback()
+    # commit하지 않았으므로 backfill도 호출하는 쪽 변경도 남지 않는다
+    assert db.get(ExampleToken, example.id) is None
+    assert db.query(Word).count() == 0
+
+    example_tokens.tokenize_examples([example], db)
+    db.commit()
+    assert db.get(ExampleToken, example.id) is not None
+
+
+def test_concurrent_backfill_conflict_only_rolls_back_savepoint(db, user_id, monkeypatch):
+    monkeypatch.setattr(example_tokens, "tokenize", _fake_tokenize)
+    example = Example(user_id=user_id, tags="food", jp_text="猫だ", kr_mean="뜻")
+    db.add(example)
+    db.flush()
+    db.add(ExampleToken(example_id=example.id, text_hash="stale", stream={}))
+    db.commit()
+
+    # 다른 요청이 먼저 저장한 상황: 같은 PK를 INSERT하려다 IntegrityError
+    monkeypatch.setattr(
+        example_tokens, "save_example_tokens",
+        lambda example_id, jp_text, tokenized, db: db.execute(insert(ExampleToken).values(example_id=example_id, text_hash="x", stream={})),
+    )
+    word = Word(user_id=user_id, lemma_id=1, lemma="猫", jp_pron="ネコ", kr_pron="네코", kr_mean="고양이", level="N5")
+    db.add(word)
+    db.flush()
+    result = example_tokens.tokenize_examples([example], db)
+    assert len(result) == 1
+    db.commit()
+    assert db.query(Word).count() == 1
@@ -0,0 +1,22 @@
+from db import Example
+from methods.example_tags import sync_example_tags
+from service.admin.filter_examples import filter_examples_by_criteria
+
+
+def test_filter_by_tags_matches_tag_substrings(db, user_id):
+    examples = [
+        Example(user_id=user_id, tags=tags, jp_text=f"文{i}", kr_mean="뜻")
+        for i, tags in enumerate(["Food, daily", "school", "fast_food", "", "100%"])
+    ]
+    db.add_all(examples)
+    db.flush()
+    sync_example_tags([(example.id, example.tags) for example in examples], db)
+    db.commit()
+
+    result = filter_examples_by_criteria(tags=["food"], db=db)
+    assert result["total_count"] == 2
+    assert {row["id"] for row in result["examples"]} == {examples[0].id, examples[2].id}
+
+    assert filter_examples_by_criteria(tags=["%"], db=db)["total_count"] == 1  # LIKE 와일드카드로 해석하지 않는다
+    assert filter_examples_by_criteria(tags=["music"], db=db) == {"examples": [], "total_count": 0}
+    assert filter_examples_by_criteria(tags=[" "], db=db)["total_count"] == len(examples)
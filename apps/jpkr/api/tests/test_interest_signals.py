@@ -0,0 +1,25 @@
+import asyncio
+import json
+
+from db import Word
+import service.words_personal as words_personal
+
+
+def test_only_words_with_reading_are_interest_signals(db, user_id, monkeypatch):
+    words = [
+        Word(user_id=user_id, lemma_id=lemma_id, lemma=lemma, jp_pron="", kr_pron="", kr_mean="", level="N5")
+        for lemma_id, lemma in ((1, "猫"), (2, "犬"))
+    ]
+    db.add_all(words)
+    db.commit()
+    recorded = {}
+    monkeypatch.setattr(words_personal, "record_low_skill_words", lambda uid, readings, session: recorded.update(readings))
+
+    base = {"jp_pron": "", "kr_pron": "", "kr_mean": "", "level": "N5"}
+    payload = [
+        {**base, "lemma_id": 1, "lemma": "猫", "reading": 3},
+        {**base, "lemma_id": 2, "lemma": "犬", "listening": 5},  # reading 없음 -> 관심 신호 아님
+    ]
+    asyncio.run(words_personal.create_words_personal(data_json=json.dumps(payload), file_meta_json="[]", files=[], db=db, user_id=user_id))
+
+    assert recorded == {words[0].id: 3}
@@ -0,0 +1,37 @@
+import threading
+import time
+
+from methods.lexicon_snapshot import LexiconSnapshot
+
+
+def test_refreshes_do_not_overlap(monkeypatch):
+    snapshot = LexiconSnapshot()
+    running, peak = [0], [0]
+    guard = threading.Lock()
+
+    def slow_refresh(db):
+        with guard:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with guard:
+            running[0] -= 1
+
+    monkeypatch.setattr(snapshot, "_refresh", slow_refresh)
+    threads = [threading.Thread(target=snapshot.refresh, args=(None,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 1
+
+
+def test_loaded_snapshot_does_not_wait_for_running_refresh(monkeypatch):
+    snapshot = LexiconSnapshot()
+    snapshot._loaded = True  # 오래된 스냅샷 (_refreshed_at = 0)
+    monkeypatch.setattr(snapshot, "_refresh", lambda db: (_ for _ in ()).throw(AssertionError("should not refresh")))
+
+    holder = threading.Thread(target=snapshot._refresh_lock.acquire)
+    holder.start()
+    holder.join()
+    snapshot.ensure_fresh(None)  # 다른 스레드가 갱신 중이면 바로 돌아온다
@@ -0,0 +1,10 @@
+from utils.lru_cache import LRUCache
+
+
+def test_get_counts_failed_validation_as_miss():
+    cache = LRUCache(4)
+    cache.put("k", ("原文", 1))
+    assert cache.get("k", validate=lambda entry: entry[0] == "原文") == ("原文", 1)
+    assert cache.get("k", validate=lambda entry: entry[0] == "別の文") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
@@ -0,0 +1,56 @@
+import uuid
+
+from db import Word, Example, WordExample, UserWordSkill, WordSkillStat, WordExampleReservoir
+from user_auth.db import User
+from _creator.service.admin.merge_duplicated_words import merge_duplicated_words
+
+
+def _word(db, user_id, lemma_id):
+    word = Word(user_id=user_id, lemma_id=lemma_id, lemma="猫", jp_pron="ネコ", kr_pron="네코", kr_mean="고양이", level="N5")
+    db.add(word)
+    db.flush()
+    return word
+
+
+def _example(db, user_id, jp_text):
+    example = Example(user_id=user_id, tags="food", jp_text=jp_text, kr_mean="뜻")
+    db.add(example)
+    db.flush()
+    return example
+
+
+def test_merge_moves_links_and_skills(db, user_id):
+    other_id = str(uuid.uuid4())
+    db.add(User(id=other_id, display_name="other"))
+    a, b = _word(db, user_id, 1), _word(db, user_id, 2)
+    e1, e2, e3 = _example(db, user_id, "猫だ"), _example(db, user_id, "猫がいる"), _example(db, user_id, "猫と犬")
+    db.add_all([
+        WordExample(word_id=a.id, example_id=e1.id),
+        WordExample(word_id=a.id, example_id=e3.id),
+        WordExample(word_id=b.id, example_id=e2.id),
+        WordExample(word_id=b.id, example_id=e3.id),  # 두 단어가 같은 예문에 연결
+        UserWordSkill(user_id=user_id, word_id=a.id, reading=20, listening=0, speaking=0),
+        UserWordSkill(user_id=user_id, word_id=b.id, reading=70, listening=0, speaking=0),
+        UserWordSkill(user_id=other_id, word_id=b.id, reading=40, listening=0, speaking=0),
+    ])
+    db.commit()
+    old_ids = [a.id, b.id]
+
+    result = merge_duplicated_words(
+        old_ids,
+        {"lemma_id": 1, "lemma": "猫", "jp_pron": "ネコ", "kr_pron": "네코", "kr_mean": "고양이", "level": "N5"},
+        db, user_id,
+    )
+    new_id = result["new_word_id"]
+    db.expire_all()
+
+    assert db.query(Word).filter(Word.id.in_(old_ids)).count() == 0
+    assert sorted(row.example_id for row in db.query(WordExample).filter_by(word_id=new_id)) == sorted([e1.id, e2.id, e3.id])
+    skills = {row.user_id: row.reading for row in db.query(UserWordSkill).filter_by(word_id=new_id)}
+    assert skills == {user_id: 70, other_id: 40}
+
+    stat = db.get(WordSkillStat, new_id)
+    assert (stat.learners, stat.reading_sum) == (2, 110)
+    assert db.query(WordSkillStat).filter(WordSkillStat.word_id.in_(old_ids)).count() == 0
+    assert sorted(db.get(WordExampleReservoir, new_id).example_ids) == sorted([e1.id, e2.id, e3.id])
+    assert db.query(WordExampleReservoir).filter(WordExampleReservoir.word_id.in_(old_ids)).count() == 0
@@ -0,0 +1,47 @@
+import threading
+
+from utils.prefetch_buffer import PrefetchBuffer
+
+
+def test_take_returns_ready_result():
+    buffer = PrefetchBuffer(ttl_sec=60, max_entries=4, workers=1, wait_sec=1)
+    try:
+        buffer.schedule("k", 1, lambda: "batch")
+        assert buffer.take("k", 1) == "batch"
+        assert buffer.take("k", 1) is None  # 한 번만 쓸 수 있음
+        assert buffer.stats()["hits"] == 1 and buffer.stats()["misses"] == 1
+    finally:
+        buffer.shutdown()
+
+
+def test_take_does_not_wait_past_wait_sec():
+    release = threading.Event()
+    buffer = PrefetchBuffer(ttl_sec=60, max_entries=4, workers=1, wait_sec=0.05)
+    try:
+        buffer.schedule("k", 1, lambda: release.wait(5) and "batch")
+        assert buffer.take("k", 1) is None  # 아직 계산 중 -> 호출한 쪽이 직접 계산
+        assert buffer.stats()["timeouts"] == 1
+    finally:
+        release.set()
+        buffer.shutdown()
+
+
+def test_version_change_is_stale():
+    buffer = PrefetchBuffer(ttl_sec=60, max_entries=4, workers=1, wait_sec=1)
+    try:
+        buffer.schedule("k", 1, lambda: "batch")
+        assert buffer.take("k", 2) is None
+        assert buffer.stats()["stale"] == 1
+    finally:
+        buffer.shutdown()
+
+
+def test_initializer_runs_on_worker_thread():
+    prepared = []
+    buffer = PrefetchBuffer(ttl_sec=60, max_entries=4, workers=1, wait_sec=1, initializer=lambda: prepared.append(threading.get_ident()))
+    try:
+        buffer.schedule("k", 1, threading.get_ident)
+        worker = buffer.take("k", 1)
+        assert prepared == [worker] and worker != threading.get_ident()
+    finally:
+        buffer.shutdown()
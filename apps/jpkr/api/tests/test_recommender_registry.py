@@ -0,0 +1,66 @@
+import threading
+
+from db import Example
+from settings import settings
+from methods import recommender_registry as registry
+from methods.example_id_pool import example_id_pool
+from methods.example_tags import sync_example_tags
+from methods.tag_index import tag_index
+
+
+def test_needs_user_falls_back_to_anonymous():
+    assert registry.get_recommender("worst_reading", None).name == settings.RECOMMEND_ANONYMOUS
+    assert registry.get_recommender(None, "u").name == settings.RECOMMEND_DEFAULT
+    assert registry.get_recommender("due", "u").name == "due"
+    assert registry.get_recommender("no-such", "u").name == settings.RECOMMEND_DEFAULT
+
+
+def test_budget_miss_and_saturation_use_fallback(db, user_id):
+    db.add_all([Example(user_id=user_id, tags="food", jp_text=f"猫{i}", kr_mean="뜻") for i in range(20)])
+    db.commit()
+    example_id_pool.invalidate()
+
+    release = threading.Event()
+
+    def blocked(limit_examples, tags, db, user_id):
+        release.wait(5)
+        return []
+
+    registry.register_recommender("blocked", blocked, budget_ms=20)
+    stats = registry._stats["blocked"]
+    try:
+        # 워커 수만큼은 제출되어 예산 초과, 그 다음부터는 제출하지 않고 바로 fallback
+        for _ in range(settings.RECOMMEND_WORKERS + 3):
+            examples = registry.recommend("blocked", 6, db=db, user_id=user_id)
+            assert len(examples) == 6
+        assert stats.budget_misses == settings.RECOMMEND_WORKERS
+        assert stats.saturated == 3
+        assert stats.fallbacks == settings.RECOMMEND_WORKERS + 3
+    finally:
+        release.set()
+        registry.shutdown_recommenders()
+        registry._registry.pop("blocked")
+        registry._stats.pop("blocked")
+        registry.fallback_pool.__init__()
+
+
+def test_fallback_pool_sees_tag_edits(db, user_id):
+    examples = [Example(user_id=user_id, tags="food", jp_text=f"猫{i}", kr_mean="뜻") for i in range(10)]
+    db.add_all(examples)
+    db.flush()
+    sync_example_tags([(example.id, example.tags) for example in examples], db)
+    db.commit()
+    example_id_pool.invalidate()
+    tag_index.invalidate()
+    pool = registry.FallbackPool()
+    try:
+        assert len(pool.sample(3, ["food"], db)) == 3
+
+        # 다른 요청이 태그를 바꾼 뒤: 풀은 그대로지만 태그 인덱스는 새로 읽어야 한다
+        sync_example_tags([(example.id, "school") for example in examples], db)
+        db.commit()
+        tag_index.invalidate()
+        assert pool.sample(3, ["food"], db) == []
+    finally:
+        tag_index.invalidate()
+        example_id_pool.invalidate()
@@ -0,0 +1,35 @@
+import uuid
+
+from db import UserText, UserTextLine
+from user_auth.db import User
+from utils.words_from_text import TokenizedText
+import service.user_text_analysis as user_text_analysis
+from service.user_text_analysis import analyze_user_text
+
+
+def _user_text(db, user_id):
+    user_text = UserText(user_id=user_id, title="t", text="猫が好きです。\n犬も好きです。", tags="")
+    db.add(user_text)
+    db.commit()
+    return user_text
+
+
+def test_other_users_text_is_not_found(db, user_id):
+    other_id = str(uuid.uuid4())
+    db.add(User(id=other_id, display_name="other"))
+    user_text = _user_text(db, other_id)
+
+    assert analyze_user_text(user_text.id, db, user_id=user_id) is None
+    assert db.query(UserTextLine).count() == 0
+
+
+def test_backfilled_lines_are_left_to_the_caller(db, user_id, monkeypatch):
+    # MeCab 없이 돌도록 토큰이 없는 분석 결과로 바꾼다
+    monkeypatch.setattr(user_text_analysis, "tokenize_long_text", lambda text: TokenizedText([[] for _ in text.split("\n")], {}))
+    user_text = _user_text(db, user_id)
+
+    assert analyze_user_text(user_text.id, db, user_id=user_id) is not None
+    assert db.query(UserTextLine).filter_by(user_text_id=user_text.id).count() == 2
+    # 줄 분석은 flush만 되어 있으므로 호출한 쪽이 commit하지 않으면 남지 않는다
+    db.rollback()
+    assert db.query(UserTextLine).filter_by(user_text_id=user_text.id).count() == 0
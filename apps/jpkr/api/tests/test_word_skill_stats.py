@@ -0,0 +1,34 @@
+import asyncio
+import json
+
+from db import Word, UserWordSkill, WordSkillStat
+from service.words_personal import create_words_personal
+
+
+def _word(db, user_id, lemma_id=1):
+    word = Word(user_id=user_id, lemma_id=lemma_id, lemma="猫", jp_pron="ネコ", kr_pron="네코", kr_mean="고양이", level="N5")
+    db.add(word)
+    db.commit()
+    return word
+
+
+def _save(db, user_id, word, reading):
+    payload = [{
+        "lemma_id": word.lemma_id, "lemma": word.lemma, "jp_pron": word.jp_pron, "kr_pron": word.kr_pron,
+        "kr_mean": word.kr_mean, "level": word.level, "reading": reading, "listening": 0, "speaking": 0,
+    }]
+    return asyncio.run(create_words_personal(data_json=json.dumps(payload), file_meta_json="[]", files=[], db=db, user_id=user_id))
+
+
+def test_stats_follow_updated_skill(db, user_id):
+    word = _word(db, user_id)
+    _save(db, user_id, word, 10)
+    assert db.get(WordSkillStat, word.id).reading_sum == 10
+
+    # 기존 숙련도 행을 갱신하는 경우: flush 전의 값으로 집계하면 안 된다
+    _save(db, user_id, word, 90)
+    db.expire_all()
+    stat = db.get(WordSkillStat, word.id)
+    assert stat.learners == 1
+    assert stat.reading_sum == 90
+    assert db.query(UserWordSkill).filter_by(word_id=word.id).one().reading == 90
@@ -51,7 +51,7 @@ export const readExamplesBatch = (exampleIds) => post_refresh(`${API_URL}/exampl
 export const updateExamplesBatch = (examplesData) => post_refresh(`${API_URL}/examples/update/batch`, examplesData);
 export const deleteExamplesBatch = (exampleIds) => post_refresh(`${API_URL}/examples/delete/batch`, exampleIds);
 export const filterExamples = (exampleFilterData) => post_refresh(`${API_URL}/examples/filter`, exampleFilterData);
-export const getExamplesForUser = (tags = []) => post_refresh(`${API_URL}/examples/get-examples-for-user`, { tags });
+export const getExamplesForUser = (tags = [], engagedExampleIds = []) => post_refresh(`${API_URL}/examples/get-examples-for-user`, { tags, engaged_example_ids: engagedExampleIds.slice(-100) });
 
 // === Text Analysis ===
 export const analyzeText = (text) => post_refresh(`${API_URL}/text/analyze`, { text });
@@ -62,6 +62,7 @@ export const getUserText = (userTextId) => get_refresh(`${API_URL}/user_text/get
 export const getUserTextList = (limit = null, offset = null) => get_refresh(`${API_URL}/user_text/all`, { params: { limit, offset } });
 export const updateUserText = (userTextData) => post_refresh(`${API_URL}/user_text/update`, userTextData);
 export const deleteUserText = (userTextId) => get_refresh(`${API_URL}/user_text/delete/${userTextId}`);
+export const analyzeUserText = (userTextId) => get_refresh(`${API_URL}/user_text/analyze/${userTextId}`);
 
 // === User Data CRUD ===
 export const getAllUsersAdmin = (limit = null, offset = null) => get_refresh(`${API_URL}/user_admin/get_all_users/${encodeURIComponent(limit)}/${encodeURIComponent(offset)}`);
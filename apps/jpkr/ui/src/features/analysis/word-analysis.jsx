@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { analyzeText, createUserText, getUserText, updateUserText } from '../../api/api';
+import { analyzeText, analyzeUserText, createUserText, getUserText, updateUserText } from '../../api/api';
 import './WordAnalysis.css';
 import WordsHighlighter from '../../components/WordsHighlighter';
 import SaveTextModal from './components/SaveTextModal';
@@ -13,7 +13,6 @@ import { sample_text } from '../../service/sample-text';
 const WordAnalysis = () => {
   const navigate = useNavigate();
   const [inputText, setInputText] = useState('');
-  const [analyzedText, setAnalyzedText] = useState('');
   const [words, setWords] = useState({});
   const [words_set, setWordsSet] = useState({});
   const [examples, setExamples] = useState({});
@@ -47,12 +46,6 @@ const WordAnalysis = () => {
     setWordsSet(words_set);
   }, [words]);
 
-  useEffect(() => {
-    if (analyzedText) {
-      handleAnalyze(analyzedText);
-    }
-  }, [analyzedText]);
-
   // 실제 단어 분석 API 호출
   const analyzeMorphology = async (text) => {
     try {
@@ -111,18 +104,35 @@ const WordAnalysis = () => {
   };
 
   // 텍스트 불러오기 핸들러
+  // 저장된 텍스트는 서버에 줄 단위 분석 결과가 있으므로 다시 형태소 분석하지 않고 그 결과를 받는다
   const handleLoadText = async (textData) => {
-    const response = await getUserText(textData.id);
-    const user_text = response.data;
-    const text_info = {}
-    text_info.id = String(user_text.id);
-    text_info.title = user_text.title;
-    text_info.tags = user_text.tags;
-    text_info.youtube_url = user_text.youtube_url;
-    text_info.audio_url = user_text.audio_url;
-    setCurrentTextInfo(text_info);
-    setInputText(user_text.text);
-    setAnalyzedText(user_text.text);
+    setIsAnalyzing(true);
+    setMessage('');
+    setWords({});
+    setExamples({});
+    try {
+      const [textResponse, analysisResponse] = await Promise.all([
+        getUserText(textData.id),
+        analyzeUserText(textData.id),
+      ]);
+      const user_text = textResponse.data;
+      const text_info = {}
+      text_info.id = String(user_text.id);
+      text_info.title = user_text.title;
+      text_info.tags = user_text.tags;
+      text_info.youtube_url = user_text.youtube_url;
+      text_info.audio_url = user_text.audio_url;
+      setCurrentTextInfo(text_info);
+      setInputText(user_text.text);
+      setWords(analysisResponse.data.words);
+      setExamples(analysisResponse.data.examples);
+      setMessage('단어 분석이 완료되었습니다.');
+    } catch (error) {
+      console.error('텍스트 불러오기 오류:', error);
+      setMessage('텍스트를 불러오는 중 오류가 발생했습니다.');
+    } finally {
+      setIsAnalyzing(false);
+    }
   };
 
   // 단어 공부하기 버튼 클릭 핸들러
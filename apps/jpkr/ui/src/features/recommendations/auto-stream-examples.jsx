@@ -19,6 +19,7 @@ const AutoStreamExamples = () => {
   const [isPlaying, setIsPlaying] = useState(false);
   const [status, setStatus] = useState('');
   const audioRef = useRef(null);
+  const playedIdsRef = useRef([]); // 마지막 요청 이후 재생한 예문 (다음 요청에 본 예문으로 보냄)
 
   const fetchBatch = useCallback(
     async (options = { append: false }) => {
@@ -26,7 +27,7 @@ const AutoStreamExamples = () => {
       append ? setLoadingMore(true) : setLoading(true);
       setError(null);
       try {
-        const response = await getExamplesForUser(selectedTags);
+        const response = await getExamplesForUser(selectedTags, playedIdsRef.current.splice(0));
         const data = response?.data || [];
         const playable = playableOnly(data);
 
@@ -112,7 +113,10 @@ const AutoStreamExamples = () => {
 
     audio
       .play()
-      .then(() => setStatus(''))
+      .then(() => {
+        setStatus('');
+        playedIdsRef.current.push(current.id);
+      })
       .catch((err) => {
         console.error('Audio playback failed', err);
         setStatus('Playback failed: moving to next example.');
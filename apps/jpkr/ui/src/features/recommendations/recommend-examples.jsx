@@ -16,7 +16,8 @@ const RecommendExamples = () => {
     setLoading(true);
     setError(null);
     try {
-      const response = await getExamplesForUser(selectedTags);
+      // 지금 보고 있던 배치를 본 예문으로 보내 다음 추천(관심 벡터)에 반영
+      const response = await getExamplesForUser(selectedTags, examples.map((example) => example.id));
       setExamples(response.data || []);
     } catch (err) {
       console.error('문장 로드 실패:', err);